@@ -10,9 +10,12 @@ import random
 import time
 from enum import Enum
 from dataclasses import dataclass
-from typing import List, Tuple, Optional
-import json
+from typing import List, Tuple, Optional, Callable, NamedTuple
 import os
+from snake_autopilot import Autopilot
+from snake_replay import ReplayRecorder
+from tick_scheduler import TickScheduler
+from leaderboard import Leaderboard
 
 class Direction(Enum):
     UP = (0, -1)
@@ -20,8 +23,8 @@ class Direction(Enum):
     LEFT = (-1, 0)
     RIGHT = (1, 0)
 
-@dataclass
-class Point:
+class Point(NamedTuple):
+    """Immutable grid cell, hashable so it can key sets and dicts"""
     x: int
     y: int
     
@@ -29,9 +32,153 @@ class Point:
         if isinstance(other, Direction):
             return Point(self.x + other.value[0], self.y + other.value[1])
         return Point(self.x + other.x, self.y + other.y)
+
+class OccupancyGrid:
+    """Per-cell bitmask of what occupies each grid cell"""
+    SNAKE = 1
+    FOOD = 2
+    SPECIAL_FOOD = 4
+    POWER_UP = 8
+    OBSTACLE = 16
+    
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.cells = [0] * (width * height)
+        # The snake can overlap itself while invincible, so count its segments
+        self.snake_counts = [0] * (width * height)
+        
+    def add(self, cell, layer):
+        """Mark a cell as occupied by a layer"""
+        index = cell.y * self.width + cell.x
+        if layer == self.SNAKE:
+            self.snake_counts[index] += 1
+        self.cells[index] |= layer
+        
+    def remove(self, cell, layer):
+        """Clear a layer from a cell"""
+        index = cell.y * self.width + cell.x
+        if layer == self.SNAKE:
+            self.snake_counts[index] -= 1
+            if self.snake_counts[index] > 0:
+                return
+        self.cells[index] &= ~layer
+        
+    def has(self, cell, layers):
+        """Check whether a cell holds any of the given layers"""
+        return self.cells[cell.y * self.width + cell.x] & layers != 0
+        
+    def is_free(self, cell):
+        """Check whether nothing at all occupies a cell"""
+        return self.cells[cell.y * self.width + cell.x] == 0
+        
+    def clear(self):
+        """Empty every layer"""
+        self.cells = [0] * (self.width * self.height)
+        self.snake_counts = [0] * (self.width * self.height)
+
+@dataclass
+class Timer:
+    deadline: int
+    callback: Callable
+    id: int
+
+class TimerWheel:
+    """Hashed timing wheel driven by game ticks instead of wall-clock time"""
+    
+    def __init__(self, slots=64):
+        # Slot count must be a power of two so the slot index is a mask
+        self.slots = [{} for _ in range(slots)]
+        self.mask = slots - 1
+        self.tick = 0
+        self.active = 0
+        self.paused = False
+        self.next_id = 0
+        
+    def schedule(self, delay, callback):
+        """Run callback after the given number of ticks"""
+        timer = Timer(self.tick + max(1, delay), callback, self.next_id)
+        self.next_id += 1
+        self.slots[timer.deadline & self.mask][timer.id] = timer
+        self.active += 1
+        return timer
+        
+    def cancel(self, timer):
+        """Cancel a pending timer, returns True if it was still pending"""
+        if timer is None:
+            return False
+        if self.slots[timer.deadline & self.mask].pop(timer.id, None) is None:
+            return False
+        self.active -= 1
+        return True
+        
+    def remaining(self, timer):
+        """Ticks left before the timer fires"""
+        return max(0, timer.deadline - self.tick)
+        
+    def advance(self):
+        """Advance one game tick and fire every timer that is due"""
+        if self.paused:
+            return
+        self.tick += 1
+        
+        # Nothing scheduled, nothing to scan
+        if not self.active:
+            return
+            
+        slot = self.slots[self.tick & self.mask]
+        if not slot:
+            return
+            
+        # Timers more than one lap away share the slot but are not due yet
+        due = [timer for timer in slot.values() if timer.deadline <= self.tick]
+        for timer in due:
+            del slot[timer.id]
+            self.active -= 1
+        for timer in due:
+            timer.callback()
+            
+    def pause(self):
+        """Stop time for all pending timers"""
+        self.paused = True
+        
+    def resume(self):
+        """Let pending timers run down again"""
+        self.paused = False
+        
+    def clear(self):
+        """Drop every pending timer"""
+        for slot in self.slots:
+            slot.clear()
+        self.active = 0
+        self.paused = False
+
+class GradientPalette:
+    """Quantized color ramp for the snake body, computed once per theme"""
+    _cache = {}
     
-    def __eq__(self, other):
-        return self.x == other.x and self.y == other.y
+    def __init__(self, start, end, steps, reach=0.7):
+        # The ramp arrives at the end color after `reach` of the body and stays there
+        self.steps = steps
+        start_rgb = [int(start[i:i + 2], 16) for i in (1, 3, 5)]
+        end_rgb = [int(end[i:i + 2], 16) for i in (1, 3, 5)]
+        self.colors = []
+        for step in range(steps):
+            t = min(1, step / steps / reach)
+            r, g, b = (int(s + (e - s) * t) for s, e in zip(start_rgb, end_rgb))
+            self.colors.append(f"#{r:02x}{g:02x}{b:02x}")
+            
+    @classmethod
+    def get(cls, start, end, steps):
+        """Shared palette for a pair of theme colors"""
+        key = (start, end, steps)
+        if key not in cls._cache:
+            cls._cache[key] = cls(start, end, steps)
+        return cls._cache[key]
+        
+    def color(self, index, length):
+        """Color of segment index in a snake of the given length"""
+        return self.colors[index * self.steps // length]
 
 class GameState(Enum):
     MENU = "menu"
@@ -40,20 +187,20 @@ class GameState(Enum):
     GAME_OVER = "game_over"
     HIGH_SCORES = "high_scores"
 
-class SnakeGame:
-    def __init__(self):
-        self.root = tk.Tk()
-        self.root.title("Advanced Snake Game")
-        self.root.geometry("800x600")
-        self.root.configure(bg='#1a1a1a')
-        self.root.resizable(False, False)
-        
+class SnakeEngine:
+    """Rules of the snake game without any UI, so games can run headless"""
+    VARIANT = 'classic'
+    
+    def __init__(self, seed=None):
         # Game constants
-        self.GRID_SIZE = 20
         self.GRID_WIDTH = 30
         self.GRID_HEIGHT = 25
-        self.CANVAS_WIDTH = self.GRID_WIDTH * self.GRID_SIZE
-        self.CANVAS_HEIGHT = self.GRID_HEIGHT * self.GRID_SIZE
+        
+        # Timed effects, measured in game ticks (one tick per snake move)
+        self.SPECIAL_FOOD_TICKS = 33
+        self.POWER_UP_TICKS = 53
+        self.SLOW_TIME_TICKS = 20
+        self.LEVEL_BANNER_TICKS = 10
         
         # Game state
         self.state = GameState.MENU
@@ -63,15 +210,268 @@ class SnakeGame:
         self.score = 0
         self.level = 1
         self.speed = 150
-        self.high_scores = self.load_high_scores()
-        self.power_ups = []
+        self.ticks = 0
+        self.power_ups = {}  # position -> expiry timer
         self.special_food = None
         self.invincible_time = 0
+        self.grid = OccupancyGrid(self.GRID_WIDTH, self.GRID_HEIGHT)
+        self.timers = TimerWheel()
+        self.special_food_timer = None
+        self.slow_time_timer = None
+        self.banner_timer = None
+        self.banner_text = None
+        self.autopilot = None
+        
+        # Every game gets its own seed so it can be replayed exactly
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.recorder = None
+        
+    def new_game(self, seed=None):
+        """Reset the rules for a new game, seeded so it can be replayed"""
+        if seed is None:
+            seed = random.randrange(2 ** 32)
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.recorder = ReplayRecorder(self.VARIANT, seed)
+        
+        self.state = GameState.PLAYING
+        self.snake = [Point(15, 12), Point(14, 12), Point(13, 12)]
+        self.direction = Direction.RIGHT
+        self.score = 0
+        self.level = 1
+        self.speed = 150
+        self.ticks = 0
+        self.power_ups = {}
+        self.special_food = None
+        self.invincible_time = 0
+        
+        self.grid.clear()
+        for segment in self.snake:
+            self.grid.add(segment, OccupancyGrid.SNAKE)
+        
+        # Timers from the previous game must not fire into this one
+        self.timers.clear()
+        self.special_food_timer = None
+        self.slow_time_timer = None
+        self.banner_timer = None
+        self.banner_text = None
+        
+        self.place_food()
+        
+    def toggle_autopilot(self):
+        """Hand the controls to the autopilot or take them back"""
+        if self.autopilot:
+            self.autopilot = None
+        else:
+            self.autopilot = Autopilot(self.GRID_WIDTH, self.GRID_HEIGHT, wrap=True)
+            
+    def steer_autopilot(self, obstacles=()):
+        """Let the autopilot pick this tick's direction"""
+        if self.autopilot:
+            dx, dy = self.autopilot.next_direction(self.snake, self.food, obstacles)
+            self.direction = Direction((dx, dy))
+            
+    def random_free_cell(self, margin=0):
+        """Pick a random cell that nothing occupies"""
+        while True:
+            x = self.rng.randint(margin, self.GRID_WIDTH - 1 - margin)
+            y = self.rng.randint(margin, self.GRID_HEIGHT - 1 - margin)
+            pos = Point(x, y)
+            
+            if self.grid.is_free(pos):
+                return pos
+                
+    def place_food(self):
+        """Place food at a random location"""
+        self.grid.remove(self.food, OccupancyGrid.FOOD)
+        self.food = self.random_free_cell()
+        self.grid.add(self.food, OccupancyGrid.FOOD)
+                
+        # Chance for special food
+        if self.rng.random() < 0.1:  # 10% chance
+            self.place_special_food()
+            
+        # Chance for power-up
+        if self.rng.random() < 0.05 and len(self.power_ups) < 2:  # 5% chance
+            self.place_power_up()
+            
+    def place_special_food(self):
+        """Place special food that gives bonus points"""
+        self.remove_special_food()
+        self.special_food = self.random_free_cell()
+        self.grid.add(self.special_food, OccupancyGrid.SPECIAL_FOOD)
+        # Special food disappears after a few seconds of play
+        self.special_food_timer = self.timers.schedule(
+            self.SPECIAL_FOOD_TICKS, self.remove_special_food
+        )
+                
+    def place_power_up(self):
+        """Place a power-up on the grid"""
+        pos = self.random_free_cell()
+        self.grid.add(pos, OccupancyGrid.POWER_UP)
+        # Power-up disappears after a while unless it is collected
+        self.power_ups[pos] = self.timers.schedule(
+            self.POWER_UP_TICKS, lambda: self.remove_power_up(pos)
+        )
+                
+    def remove_special_food(self):
+        """Remove special food from the grid"""
+        self.timers.cancel(self.special_food_timer)
+        self.special_food_timer = None
+        if self.special_food:
+            self.grid.remove(self.special_food, OccupancyGrid.SPECIAL_FOOD)
+        self.special_food = None
+        
+    def remove_power_up(self, power_up_pos):
+        """Remove a specific power-up from the grid"""
+        if power_up_pos in self.power_ups:
+            self.timers.cancel(self.power_ups.pop(power_up_pos))
+            self.grid.remove(power_up_pos, OccupancyGrid.POWER_UP)
+            
+    def move_snake(self):
+        """Move the snake and handle collisions"""
+        if self.state != GameState.PLAYING:
+            return
+            
+        self.steer_autopilot()
+        self.record_tick()
+        
+        # Calculate new head position, wrapping around the walls
+        new_head = self.next_head()
+        
+        # Check self collision (unless invincible)
+        if self.invincible_time <= 0 and self.grid.has(new_head, OccupancyGrid.SNAKE):
+            self.game_over()
+            return
+            
+        # Move snake
+        self.push_head(new_head)
+        
+        # Check food collision
+        ate_food = False
+        if new_head == self.food:
+            self.score += 10 * self.level
+            ate_food = True
+            self.place_food()
+            
+        # Check special food collision
+        elif self.special_food and new_head == self.special_food:
+            self.score += 50 * self.level
+            ate_food = True
+            self.remove_special_food()
+            
+        # Check power-up collision
+        elif new_head in self.power_ups:
+            self.remove_power_up(new_head)
+            self.activate_power_up()
+            
+        # Remove tail if no food eaten
+        if not ate_food:
+            self.pop_tail()
+        else:
+            # Check for level up
+            if self.score >= self.level * 200:
+                self.level_up()
+                
+        # Decrease invincibility time
+        if self.invincible_time > 0:
+            self.invincible_time -= 1
+            
+        # Run down timed effects
+        self.timers.advance()
+            
+    def record_tick(self):
+        """Count a move and log the direction it was made in"""
+        self.ticks += 1
+        if self.recorder:
+            self.recorder.record(self)
+            
+    def next_head(self):
+        """Cell the head moves into this tick, wrapping around the walls"""
+        head = self.snake[0]
+        dx, dy = self.direction.value
+        return Point((head.x + dx) % self.GRID_WIDTH, (head.y + dy) % self.GRID_HEIGHT)
+        
+    def push_head(self, cell):
+        """Grow the snake into a new head cell"""
+        self.snake.insert(0, cell)
+        self.grid.add(cell, OccupancyGrid.SNAKE)
+        
+    def pop_tail(self):
+        """Drop the last tail segment"""
+        self.grid.remove(self.snake.pop(), OccupancyGrid.SNAKE)
+        
+    def activate_power_up(self):
+        """Activate a random power-up effect"""
+        effects = ['invincible', 'slow_time', 'bonus_points', 'shrink']
+        effect = self.rng.choice(effects)
+        
+        if effect == 'invincible':
+            self.invincible_time = 30  # 30 moves of invincibility
+        elif effect == 'slow_time':
+            self.speed = min(self.speed + 50, 300)  # Temporarily slow down
+            self.timers.cancel(self.slow_time_timer)
+            self.slow_time_timer = self.timers.schedule(self.SLOW_TIME_TICKS, self.restore_speed)
+        elif effect == 'bonus_points':
+            self.score += 100 * self.level
+        elif effect == 'shrink':
+            if len(self.snake) > 3:
+                for segment in self.snake[len(self.snake)//2:]:
+                    self.grid.remove(segment, OccupancyGrid.SNAKE)
+                self.snake = self.snake[:len(self.snake)//2]
+                
+    def restore_speed(self):
+        """Restore normal game speed"""
+        self.slow_time_timer = None
+        self.speed = max(50, 150 - (self.level - 1) * 10)
+        
+    def level_up(self):
+        """Increase game level and difficulty"""
+        self.level += 1
+        self.speed = max(50, self.speed - 10)  # Increase speed
+        
+        # Show level up message for a few moves
+        self.banner_text = f"LEVEL {self.level}!"
+        self.timers.cancel(self.banner_timer)
+        self.banner_timer = self.timers.schedule(self.LEVEL_BANNER_TICKS, self.clear_banner)
+        
+    def clear_banner(self):
+        """Hide the level up message"""
+        self.banner_timer = None
+        self.banner_text = None
+        
+    def game_over(self):
+        """End the game"""
+        self.state = GameState.GAME_OVER
+        if self.recorder:
+            self.recorder.finish(self)
+
+class SnakeGame(SnakeEngine):
+    """Tkinter front end: menus, drawing and keyboard control"""
+    
+    def __init__(self, seed=None):
+        super().__init__(seed)
+        self.root = tk.Tk()
+        self.root.title("Advanced Snake Game")
+        self.root.geometry("800x600")
+        self.root.configure(bg='#1a1a1a')
+        self.root.resizable(False, False)
+        self.ticker = TickScheduler(self.root)
+        
+        # Display constants
+        self.GRID_SIZE = 20
+        self.CANVAS_WIDTH = self.GRID_WIDTH * self.GRID_SIZE
+        self.CANVAS_HEIGHT = self.GRID_HEIGHT * self.GRID_SIZE
+        # The old JSON top 10 was kept by whichever variant this script runs
+        self.leaderboard = Leaderboard('high_scores.db', 'snake', legacy_json='high_scores.json',
+                                       legacy_mode=self.VARIANT)
         
         # Colors
         self.colors = {
             'bg': '#0f0f0f',
             'snake': '#00ff00',
+            'snake_tail': '#004c00',
             'snake_head': '#00cc00',
             'food': '#ff0000',
             'special_food': '#ffd700',
@@ -82,6 +482,15 @@ class SnakeGame:
             'button_hover': '#6a6a6a'
         }
         
+        # Body colors come from a precomputed ramp, and the snake's canvas
+        # items are kept between frames so only moved or recolored ones change
+        self.SNAKE_GRADIENT_STEPS = 32
+        self.snake_palette = GradientPalette.get(
+            self.colors['snake'], self.colors['snake_tail'], self.SNAKE_GRADIENT_STEPS
+        )
+        self.snake_items = []
+        self.snake_fills = []
+        
         self.setup_ui()
         self.bind_keys()
         
@@ -139,7 +548,7 @@ class SnakeGame:
         
         subtitle = tk.Label(
             self.menu_frame,
-            text="Navigate with WASD or Arrow Keys",
+            text="Navigate with WASD or Arrow Keys, B for autopilot",
             font=("Arial", 14),
             fg=self.colors['text'],
             bg='#1a1a1a'
@@ -204,6 +613,8 @@ class SnakeGame:
                 self.direction = Direction.RIGHT
             elif key == 'p':
                 self.toggle_pause()
+            elif key == 'b':
+                self.toggle_autopilot()
         elif self.state == GameState.PAUSED:
             if event.keysym.lower() == 'p':
                 self.toggle_pause()
@@ -215,17 +626,7 @@ class SnakeGame:
                 
     def start_game(self):
         """Initialize and start a new game"""
-        self.state = GameState.PLAYING
-        self.snake = [Point(15, 12), Point(14, 12), Point(13, 12)]
-        self.direction = Direction.RIGHT
-        self.score = 0
-        self.level = 1
-        self.speed = 150
-        self.power_ups = []
-        self.special_food = None
-        self.invincible_time = 0
-        
-        self.place_food()
+        self.new_game()
         self.show_game()
         self.game_loop()
         
@@ -263,8 +664,8 @@ class SnakeGame:
         )
         title.pack(pady=20)
         
-        for i, score in enumerate(self.high_scores[:10], 1):
-            score_text = f"{i:2d}. {score:6d}"
+        for i, (player, score) in enumerate(self.leaderboard.top(10, self.VARIANT), 1):
+            score_text = f"{i:2d}. {player[:10]:<10} {score:6d}"
             score_label = tk.Label(
                 scores_window,
                 text=score_text,
@@ -274,160 +675,21 @@ class SnakeGame:
             )
             score_label.pack(pady=2)
             
-    def place_food(self):
-        """Place food at a random location"""
-        while True:
-            x = random.randint(0, self.GRID_WIDTH - 1)
-            y = random.randint(0, self.GRID_HEIGHT - 1)
-            food_pos = Point(x, y)
-            
-            if food_pos not in self.snake:
-                self.food = food_pos
-                break
-                
-        # Chance for special food
-        if random.random() < 0.1:  # 10% chance
-            self.place_special_food()
-            
-        # Chance for power-up
-        if random.random() < 0.05 and len(self.power_ups) < 2:  # 5% chance
-            self.place_power_up()
-            
-    def place_special_food(self):
-        """Place special food that gives bonus points"""
-        while True:
-            x = random.randint(0, self.GRID_WIDTH - 1)
-            y = random.randint(0, self.GRID_HEIGHT - 1)
-            pos = Point(x, y)
-            
-            if pos not in self.snake and pos != self.food:
-                self.special_food = pos
-                # Special food disappears after 5 seconds
-                self.root.after(5000, self.remove_special_food)
-                break
-                
-    def place_power_up(self):
-        """Place a power-up on the grid"""
-        while True:
-            x = random.randint(0, self.GRID_WIDTH - 1)
-            y = random.randint(0, self.GRID_HEIGHT - 1)
-            pos = Point(x, y)
-            
-            if (pos not in self.snake and pos != self.food and 
-                pos != self.special_food and pos not in self.power_ups):
-                self.power_ups.append(pos)
-                # Power-up disappears after 8 seconds
-                self.root.after(8000, lambda p=pos: self.remove_power_up(p))
-                break
-                
-    def remove_special_food(self):
-        """Remove special food from the grid"""
-        self.special_food = None
-        
-    def remove_power_up(self, power_up_pos):
-        """Remove a specific power-up from the grid"""
-        if power_up_pos in self.power_ups:
-            self.power_ups.remove(power_up_pos)
-            
-    def move_snake(self):
-        """Move the snake and handle collisions"""
-        if self.state != GameState.PLAYING:
-            return
-            
-        # Calculate new head position
-        head = self.snake[0]
-        new_head = head + self.direction
-        
-        # Handle wall collision (wrap around)
-        new_head.x = new_head.x % self.GRID_WIDTH
-        new_head.y = new_head.y % self.GRID_HEIGHT
-        
-        # Check self collision (unless invincible)
-        if self.invincible_time <= 0 and new_head in self.snake:
-            self.game_over()
-            return
-            
-        # Move snake
-        self.snake.insert(0, new_head)
-        
-        # Check food collision
-        ate_food = False
-        if new_head == self.food:
-            self.score += 10 * self.level
-            ate_food = True
-            self.place_food()
-            
-        # Check special food collision
-        elif self.special_food and new_head == self.special_food:
-            self.score += 50 * self.level
-            ate_food = True
-            self.special_food = None
-            
-        # Check power-up collision
-        elif new_head in self.power_ups:
-            self.power_ups.remove(new_head)
-            self.activate_power_up()
-            
-        # Remove tail if no food eaten
-        if not ate_food:
-            self.snake.pop()
-        else:
-            # Check for level up
-            if self.score >= self.level * 200:
-                self.level_up()
-                
-        # Decrease invincibility time
-        if self.invincible_time > 0:
-            self.invincible_time -= 1
-            
-    def activate_power_up(self):
-        """Activate a random power-up effect"""
-        effects = ['invincible', 'slow_time', 'bonus_points', 'shrink']
-        effect = random.choice(effects)
-        
-        if effect == 'invincible':
-            self.invincible_time = 30  # 30 moves of invincibility
-        elif effect == 'slow_time':
-            self.speed = min(self.speed + 50, 300)  # Temporarily slow down
-            self.root.after(3000, self.restore_speed)
-        elif effect == 'bonus_points':
-            self.score += 100 * self.level
-        elif effect == 'shrink':
-            if len(self.snake) > 3:
-                self.snake = self.snake[:len(self.snake)//2]
-                
-    def restore_speed(self):
-        """Restore normal game speed"""
-        self.speed = max(50, 150 - (self.level - 1) * 10)
-        
-    def level_up(self):
-        """Increase game level and difficulty"""
-        self.level += 1
-        self.speed = max(50, self.speed - 10)  # Increase speed
-        
-        # Show level up message
-        self.canvas.create_text(
-            self.CANVAS_WIDTH // 2,
-            self.CANVAS_HEIGHT // 2,
-            text=f"LEVEL {self.level}!",
-            font=("Arial", 24, "bold"),
-            fill='#ffff00',
-            tags="level_up"
-        )
-        self.root.after(1500, lambda: self.canvas.delete("level_up"))
-        
     def toggle_pause(self):
         """Toggle game pause state"""
         if self.state == GameState.PLAYING:
             self.state = GameState.PAUSED
+            self.timers.pause()
         elif self.state == GameState.PAUSED:
             self.state = GameState.PLAYING
+            self.timers.resume()
             self.game_loop()
             
     def game_over(self):
         """Handle game over"""
-        self.state = GameState.GAME_OVER
+        super().game_over()
         self.update_high_scores()
+        self.save_replay()
         
         # Show game over screen
         self.canvas.create_rectangle(
@@ -471,31 +733,22 @@ class SnakeGame:
             tags="game_over"
         )
         
-    def update_high_scores(self):
-        """Update high scores with current score"""
-        self.high_scores.append(self.score)
-        self.high_scores.sort(reverse=True)
-        self.high_scores = self.high_scores[:10]  # Keep top 10
-        self.save_high_scores()
-        
-    def load_high_scores(self):
-        """Load high scores from file"""
-        try:
-            if os.path.exists('high_scores.json'):
-                with open('high_scores.json', 'r') as f:
-                    return json.load(f)
-        except:
-            pass
-        return [0] * 10
-        
-    def save_high_scores(self):
-        """Save high scores to file"""
+    def save_replay(self):
+        """Archive the finished game so it can be replayed and checked later"""
+        if not self.recorder:
+            return
         try:
-            with open('high_scores.json', 'w') as f:
-                json.dump(self.high_scores, f)
-        except:
+            os.makedirs('replays', exist_ok=True)
+            stamp = time.strftime('%Y%m%d-%H%M%S')
+            path = os.path.join('replays', f"{self.VARIANT}-{stamp}-{self.seed}.snkr")
+            self.recorder.replay().save(path)
+        except OSError:
             pass
             
+    def update_high_scores(self):
+        """Update high scores with current score"""
+        self.leaderboard.submit(self.score, self.VARIANT)
+        
     def draw_grid(self):
         """Draw background grid"""
         self.canvas.delete("grid")
@@ -512,7 +765,14 @@ class SnakeGame:
             
     def draw_snake(self):
         """Draw the snake with gradient effect"""
-        self.canvas.delete("snake")
+        items = self.snake_items
+        fills = self.snake_fills
+        length = len(self.snake)
+        
+        # Drop the items of segments lost to a shrink
+        while len(items) > length:
+            self.canvas.delete(items.pop())
+            fills.pop()
         
         for i, segment in enumerate(self.snake):
             x1 = segment.x * self.GRID_SIZE
@@ -527,14 +787,22 @@ class SnakeGame:
                     color = '#ffff00' if self.invincible_time % 4 < 2 else self.colors['snake_head']
             else:  # Body
                 # Gradient effect
-                intensity = max(0.3, 1 - (i / len(self.snake)))
-                green_value = int(255 * intensity)
-                color = f"#{0:02x}{green_value:02x}{0:02x}"
+                color = self.snake_palette.color(i, length)
                 
-            self.canvas.create_rectangle(
-                x1 + 1, y1 + 1, x2 - 1, y2 - 1,
-                fill=color, outline='#004400', width=1, tags="snake"
-            )
+            if i < len(items):
+                self.canvas.coords(items[i], x1 + 1, y1 + 1, x2 - 1, y2 - 1)
+                if fills[i] != color:
+                    self.canvas.itemconfigure(items[i], fill=color)
+                    fills[i] = color
+            else:
+                items.append(self.canvas.create_rectangle(
+                    x1 + 1, y1 + 1, x2 - 1, y2 - 1,
+                    fill=color, outline='#004400', width=1, tags="snake"
+                ))
+                fills.append(color)
+                
+        # The rest of the frame is redrawn around the snake, keep it on top
+        self.canvas.tag_raise("snake")
             
     def draw_food(self):
         """Draw food items"""
@@ -591,6 +859,17 @@ class SnakeGame:
         self.score_label.config(text=f"Score: {self.score}")
         self.level_label.config(text=f"Level: {self.level}")
         
+        # Draw level up message
+        if self.banner_text:
+            self.canvas.create_text(
+                self.CANVAS_WIDTH // 2,
+                self.CANVAS_HEIGHT // 2,
+                text=self.banner_text,
+                font=("Arial", 24, "bold"),
+                fill='#ffff00',
+                tags="level_up"
+            )
+            
         # Draw pause indicator
         if self.state == GameState.PAUSED:
             self.canvas.create_text(
@@ -610,13 +889,18 @@ class SnakeGame:
         if self.state == GameState.PLAYING:
             self.move_snake()
             self.draw_game()
-            self.root.after(self.speed, self.game_loop)
-        elif self.state == GameState.PAUSED:
+            self.ticker.schedule(self.game_loop, self.speed)
+            return
+            
+        # The loop stops here, start a fresh schedule when it resumes
+        self.ticker.reset()
+        if self.state == GameState.PAUSED:
             self.draw_ui()  # Keep drawing pause message
             
     def draw_game(self):
         """Draw all game elements"""
-        self.canvas.delete("all")
+        # Snake items are reused between frames, everything else is redrawn
+        self.canvas.delete("!snake")
         self.draw_grid()
         self.draw_food()
         self.draw_power_ups()
@@ -626,62 +910,54 @@ class SnakeGame:
     def run(self):
         """Start the game application"""
         self.root.mainloop()
+        self.leaderboard.close()
 
 # Game variations and additional features
-class AdvancedSnakeGame(SnakeGame):
-    """Extended version with even more features"""
+class AdvancedSnakeEngine(SnakeEngine):
+    """Rules with obstacles and combos on top of the classic game"""
+    VARIANT = 'advanced'
     
-    def __init__(self):
-        super().__init__()
+    def __init__(self, seed=None):
+        super().__init__(seed)
         self.obstacles = []
         self.multiplier = 1
         self.combo_count = 0
         
-    def start_game(self):
+    def new_game(self, seed=None):
         """Override to add obstacles"""
-        super().start_game()
+        super().new_game(seed)
+        self.combo_count = 0
         self.create_obstacles()
         
     def create_obstacles(self):
         """Create random obstacles on higher levels"""
+        for obstacle in self.obstacles:
+            self.grid.remove(obstacle, OccupancyGrid.OBSTACLE)
         self.obstacles = []
         if self.level >= 3:
             num_obstacles = min(self.level - 2, 8)
             for _ in range(num_obstacles):
-                while True:
-                    x = random.randint(2, self.GRID_WIDTH - 3)
-                    y = random.randint(2, self.GRID_HEIGHT - 3)
-                    pos = Point(x, y)
-                    
-                    if (pos not in self.snake and pos != self.food and 
-                        pos not in self.obstacles):
-                        self.obstacles.append(pos)
-                        break
+                pos = self.random_free_cell(margin=2)
+                self.grid.add(pos, OccupancyGrid.OBSTACLE)
+                self.obstacles.append(pos)
                         
     def move_snake(self):
         """Override to handle obstacle collisions"""
         if self.state != GameState.PLAYING:
             return
             
-        head = self.snake[0]
-        new_head = head + self.direction
+        self.steer_autopilot(self.obstacles)
+        self.record_tick()
+        new_head = self.next_head()
         
-        # Handle wall collision
-        new_head.x = new_head.x % self.GRID_WIDTH
-        new_head.y = new_head.y % self.GRID_HEIGHT
-        
-        # Check obstacle collision
-        if self.invincible_time <= 0 and new_head in self.obstacles:
-            self.game_over()
-            return
-            
-        # Check self collision
-        if self.invincible_time <= 0 and new_head in self.snake:
+        # Check obstacle and self collision in a single lookup
+        if (self.invincible_time <= 0 and
+                self.grid.has(new_head, OccupancyGrid.OBSTACLE | OccupancyGrid.SNAKE)):
             self.game_over()
             return
             
         # Move snake
-        self.snake.insert(0, new_head)
+        self.push_head(new_head)
         
         # Food collision logic with combo system
         ate_food = False
@@ -701,16 +977,16 @@ class AdvancedSnakeGame(SnakeGame):
                 points *= self.combo_count
             self.score += points
             ate_food = True
-            self.special_food = None
+            self.remove_special_food()
             
         elif new_head in self.power_ups:
-            self.power_ups.remove(new_head)
+            self.remove_power_up(new_head)
             self.activate_power_up()
         else:
             self.combo_count = 0  # Reset combo
             
         if not ate_food:
-            self.snake.pop()
+            self.pop_tail()
         else:
             if self.score >= self.level * 200:
                 self.level_up()
@@ -718,6 +994,16 @@ class AdvancedSnakeGame(SnakeGame):
         if self.invincible_time > 0:
             self.invincible_time -= 1
             
+        self.timers.advance()
+            
+    def level_up(self):
+        """Override to recreate obstacles"""
+        super().level_up()
+        self.create_obstacles()
+
+class AdvancedSnakeGame(AdvancedSnakeEngine, SnakeGame):
+    """Extended version with even more features"""
+    
     def draw_obstacles(self):
         """Draw obstacles"""
         self.canvas.delete("obstacle")
@@ -735,7 +1021,8 @@ class AdvancedSnakeGame(SnakeGame):
             
     def draw_game(self):
         """Override to include obstacles"""
-        self.canvas.delete("all")
+        # Snake items are reused between frames, everything else is redrawn
+        self.canvas.delete("!snake")
         self.draw_grid()
         self.draw_obstacles()
         self.draw_food()
@@ -752,11 +1039,6 @@ class AdvancedSnakeGame(SnakeGame):
                 fill='#ffff00',
                 tags="ui"
             )
-            
-    def level_up(self):
-        """Override to recreate obstacles"""
-        super().level_up()
-        self.create_obstacles()
 
 def main():
     """Main function to run the game"""
@@ -777,6 +1059,7 @@ def main():
         print("\nControls:")
         print("  • WASD or Arrow Keys to move")
         print("  • P to pause/unpause")
+        print("  • B to toggle the autopilot")
         print("  • R to restart (when game over)")
         print("  • ESC to return to menu (when game over)")
         print("\nStarting game...")
@@ -1,6 +1,9 @@
 import tkinter as tk
 import random
 from enum import Enum
+from snake_autopilot import Autopilot
+from snake_hamiltonian import HamiltonianSolver
+from tick_scheduler import TickScheduler
 
 class Direction(Enum):
     UP = (0, -1)
@@ -14,6 +17,7 @@ class SnakeGame:
         self.root = tk.Tk()
         self.root.title("Snake Game")
         self.root.resizable(False, False)
+        self.ticker = TickScheduler(self.root)
         
         # Game constants
         self.WINDOW_WIDTH = 800
@@ -22,6 +26,7 @@ class SnakeGame:
         self.GRID_WIDTH = self.WINDOW_WIDTH // self.GRID_SIZE
         self.GRID_HEIGHT = self.WINDOW_HEIGHT // self.GRID_SIZE
         self.GAME_SPEED = 150  # milliseconds between moves
+        self.autopilot = None
         
         # Colors
         self.BG_COLOR = "#1a1a2e"
@@ -67,6 +72,8 @@ class SnakeGame:
         self.direction = Direction.RIGHT
         self.next_direction = Direction.RIGHT
         self.food = self.generate_food()
+        if self.autopilot:
+            self.autopilot.reset()
         self.score = 0
         self.game_over = False
         self.game_started = False
@@ -74,6 +81,9 @@ class SnakeGame:
         
     def generate_food(self):
         """Generate food at random position not occupied by snake"""
+        # Board is full, nothing left to place
+        if len(self.snake) >= self.GRID_WIDTH * self.GRID_HEIGHT:
+            return None
         while True:
             food_x = random.randint(0, self.GRID_WIDTH - 1)
             food_y = random.randint(0, self.GRID_HEIGHT - 1)
@@ -90,6 +100,18 @@ class SnakeGame:
                 self.reset_game()
             return
         
+        # Toggle the autopilot
+        if key == 'b':
+            self.autopilot = None if self.autopilot else Autopilot(self.GRID_WIDTH, self.GRID_HEIGHT)
+            self.game_started = True
+            return
+        
+        # Toggle the Hamiltonian solver, which never dies
+        if key == 'h':
+            self.autopilot = None if self.autopilot else HamiltonianSolver(self.GRID_WIDTH, self.GRID_HEIGHT)
+            self.game_started = True
+            return
+        
         if not self.game_started:
             if key in ['up', 'down', 'left', 'right', 'w', 'a', 's', 'd']:
                 self.game_started = True
@@ -139,6 +161,8 @@ class SnakeGame:
         if new_head == self.food:
             self.score += 10
             self.food = self.generate_food()
+            if self.food is None:
+                self.game_over = True
             
             # Update high score
             if self.score > self.high_score:
@@ -291,6 +315,8 @@ class SnakeGame:
                 "Use ARROW KEYS or WASD to move",
                 "Eat the red food to grow",
                 "Don't hit walls or yourself!",
+                "Press B to toggle the autopilot",
+                "Press H for the never-dying Hamiltonian solver",
                 "",
                 "Press any arrow key to start"
             ]
@@ -384,7 +410,8 @@ class SnakeGame:
         
         # Draw game elements
         if self.game_started:
-            self.draw_food()
+            if self.food:
+                self.draw_food()
             self.draw_snake()
         
         # Draw UI elements
@@ -417,6 +444,11 @@ class SnakeGame:
         if not self.game_started or self.game_over:
             return
         
+        # Let the autopilot steer
+        if self.autopilot:
+            self.direction = Direction(self.autopilot.next_direction(self.snake, self.food))
+            self.next_direction = self.direction
+        
         # Get current head position
         head_x, head_y = self.snake[0]
         
@@ -444,6 +476,8 @@ class SnakeGame:
         if new_head == self.food:
             self.score += 10
             self.food = self.generate_food()
+            if self.food is None:
+                self.game_over = True
             
             # Update high score
             if self.score > self.high_score:
@@ -465,7 +499,7 @@ class SnakeGame:
         self.draw_everything()
         
         # Schedule next frame
-        self.root.after(self.GAME_SPEED, self.game_loop)
+        self.ticker.schedule(self.game_loop, self.GAME_SPEED)
     
     def run(self):
         """Start the game"""
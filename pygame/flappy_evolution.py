@@ -0,0 +1,203 @@
+"""
+Flappy Evolution
+Evolves Flappy Bird controllers with a whole population flying at once.
+
+The rules are those of FlappyBird in fourth.py. Every bird flies at the
+same x through the same seeded pipes, so the pipes are stepped once per
+frame for everyone and only the birds' heights and velocities are arrays.
+Each bird is steered by its own small MLP: four inputs, eight tanh hidden
+units, and a flap whenever the output is positive.
+
+Weights are stored parameter-major, one float32 row per weight across the
+whole population. A layer for every bird at once is then a handful of
+multiply-adds over contiguous rows, several times faster than a batched
+matmul of thousands of tiny per-bird matrices. Birds that die are dropped
+from the arrays, so each frame costs only as much as its survivors.
+"""
+
+import argparse
+import random
+import time
+
+import numpy as np
+
+from fourth import PipeRing
+
+# The same numbers as FlappyBird
+WINDOW_WIDTH = 800
+WINDOW_HEIGHT = 600
+BIRD_X = 100
+BIRD_SIZE = 30
+PIPE_WIDTH = 80
+PIPE_GAP = 200
+GRAVITY = 0.5
+JUMP_VELOCITY = -10
+PIPE_VELOCITY = -3
+GROUND_HEIGHT = 100
+
+INPUTS = 4
+HIDDEN = 8
+# First-layer weights, first-layer biases, output weights, output bias
+GENOME = INPUTS * HIDDEN + HIDDEN + HIDDEN + 1
+
+
+class PipeCourse:
+    """The pipes of one seeded game, stepped like FlappyBird.update_pipes"""
+
+    def __init__(self, seed):
+        self.rng = random.Random(seed)
+        self.pipes = PipeRing(4, PIPE_WIDTH)
+        self.passed = 0
+        for i in range(3):
+            self.pipes.push(WINDOW_WIDTH + i * 300, self.gap_height())
+
+    def gap_height(self):
+        """Height of the next pipe's upper half"""
+        return self.rng.randint(100, WINDOW_HEIGHT - PIPE_GAP - GROUND_HEIGHT - 100)
+
+    def step(self):
+        """Scroll one frame, score a passed pipe and spawn new ones"""
+        pipes = self.pipes
+        pipes.advance(PIPE_VELOCITY)
+
+        s = pipes.first_unpassed()
+        if s is not None and pipes.x[s] + PIPE_WIDTH < BIRD_X:
+            pipes.passed[s] = True
+            self.passed += 1
+
+        while pipes.count and pipes.x[pipes.head] <= -PIPE_WIDTH:
+            pipes.pop()
+
+        if pipes.count < 3:
+            last_pipe_x = pipes.tail_x() if pipes.count else WINDOW_WIDTH
+            if last_pipe_x < WINDOW_WIDTH + 100:
+                pipes.push(last_pipe_x + 300, self.gap_height())
+
+    def nearest(self):
+        """(x, gap height) of the pipe the birds have to get through next"""
+        s = self.pipes.nearest(BIRD_X - BIRD_SIZE // 2)
+        if s is None:
+            return WINDOW_WIDTH, (WINDOW_HEIGHT - GROUND_HEIGHT - PIPE_GAP) // 2
+        return self.pipes.x[s], self.pipes.height[s]
+
+
+def random_genomes(count, rng):
+    """Fresh population of count birds, one column each"""
+    return rng.standard_normal((GENOME, count)).astype(np.float32)
+
+
+def split(genomes):
+    """Views of a (GENOME, birds) array as first-layer weights and biases, output weights and bias"""
+    count = genomes.shape[1]
+    w1 = genomes[:INPUTS * HIDDEN].reshape(INPUTS, HIDDEN, count)
+    b1 = genomes[INPUTS * HIDDEN:INPUTS * HIDDEN + HIDDEN]
+    w2 = genomes[INPUTS * HIDDEN + HIDDEN:-1]
+    return w1, b1, w2, genomes[-1]
+
+
+def fly(genomes, seed, max_steps=10000):
+    """Fly every bird through one seeded course
+
+    Returns the frames each bird survived, the pipes it passed, and how many
+    frames were simulated before the last bird died.
+    """
+    count = genomes.shape[1]
+    course = PipeCourse(seed)
+    steps = np.full(count, max_steps)
+    pipes = np.zeros(count, dtype=np.int64)
+
+    # State of the birds still flying; ids maps them back to the population
+    ids = np.arange(count)
+    y = np.full(count, float(WINDOW_HEIGHT // 2))
+    v = np.zeros(count)
+    w1, b1, w2, b2 = split(genomes)
+    hidden = np.empty((HIDDEN, count), dtype=np.float32)
+    term = np.empty((HIDDEN, count), dtype=np.float32)
+
+    floor = WINDOW_HEIGHT - GROUND_HEIGHT - BIRD_SIZE // 2
+    ceiling = BIRD_SIZE // 2
+    for step in range(max_steps):
+        pipe_x, gap = course.nearest()
+        gap_centre = gap + PIPE_GAP / 2
+
+        # Policy for every bird: height, speed, distance to the pipe, offset from the gap
+        n = len(ids)
+        h, t = hidden[:, :n], term[:, :n]
+        np.multiply(w1[0], (y * (1 / WINDOW_HEIGHT) - 0.5).astype(np.float32), out=h)
+        np.multiply(w1[1], (v * 0.1).astype(np.float32), out=t)
+        h += t
+        np.multiply(w1[3], ((gap_centre - y) * (1 / PIPE_GAP)).astype(np.float32), out=t)
+        h += t
+        np.multiply(w1[2], np.float32((pipe_x - BIRD_X) / 300), out=t)
+        h += t
+        h += b1
+        np.tanh(h, out=h)
+        h *= w2
+        flap = h.sum(axis=0) + b2 > 0
+
+        # FlappyBird.update_bird
+        v[flap] = JUMP_VELOCITY
+        v += GRAVITY
+        y += v
+        dead = y > floor
+        top = y < ceiling
+        y[top] = ceiling
+        v[top] = 0
+        # A bird on the ground ends its game before the pipes move
+        score = course.passed
+
+        # FlappyBird.update_pipes and check_collisions, for everyone left
+        course.step()
+        s = course.pipes.nearest(BIRD_X - BIRD_SIZE // 2)
+        if s is not None and BIRD_X + BIRD_SIZE // 2 > course.pipes.x[s]:
+            gap = course.pipes.height[s]
+            hit = (y - BIRD_SIZE // 2 < gap) | (y + BIRD_SIZE // 2 > gap + PIPE_GAP)
+            hit &= ~dead
+            pipes[ids[hit]] = course.passed
+            steps[ids[hit]] = step + 1
+        else:
+            hit = None
+
+        if dead.any() or (hit is not None and hit.any()):
+            pipes[ids[dead]] = score
+            steps[ids[dead]] = step + 1
+            if hit is not None:
+                dead |= hit
+            alive = ~dead
+            ids, y, v = ids[alive], y[alive], v[alive]
+            genomes = genomes[:, alive]
+            w1, b1, w2, b2 = split(genomes)
+            if not len(ids):
+                return steps, pipes, step + 1
+
+    pipes[ids] = course.passed
+    return steps, pipes, max_steps
+
+
+def evolve(birds=10000, generations=20, max_steps=10000, seed=0, elite=0.1, sigma=0.1):
+    """Keep the longest flyers of each generation and refill with mutated copies of them"""
+    rng = np.random.default_rng(seed)
+    genomes = random_genomes(birds, rng)
+    keep = max(1, int(birds * elite))
+    for generation in range(generations):
+        start = time.perf_counter()
+        steps, pipes, frames = fly(genomes, seed * 1000 + generation, max_steps)
+        elapsed = time.perf_counter() - start
+        print(f"Generation {generation}: best {pipes.max()} pipes, mean {steps.mean():.0f} frames, "
+              f"{frames / elapsed:,.0f} frames/s, {steps.sum() / elapsed / 1e6:.1f}M bird-frames/s")
+
+        parents = genomes[:, np.argsort(-steps, kind='stable')[:keep]]
+        children = parents[:, rng.integers(keep, size=birds - keep)]
+        children += rng.standard_normal(children.shape, dtype=np.float32) * np.float32(sigma)
+        genomes = np.concatenate([parents, children], axis=1)
+    return genomes
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Evolve Flappy Bird controllers")
+    parser.add_argument('--birds', type=int, default=10000)
+    parser.add_argument('--generations', type=int, default=20)
+    parser.add_argument('--steps', type=int, default=10000, help="frame limit per generation")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    evolve(args.birds, args.generations, args.steps, args.seed)
@@ -1,6 +1,68 @@
 import tkinter as tk
 import random
 import math
+from tick_scheduler import TickScheduler
+
+class PipeRing:
+    """Fixed number of pipe slots in parallel lists, used as a ring: oldest pipe at head, newest at tail"""
+    
+    def __init__(self, capacity, width):
+        self.capacity = capacity
+        self.width = width
+        self.x = [0] * capacity
+        self.height = [0] * capacity
+        self.passed = [False] * capacity
+        self.ids = [0] * capacity  # serial number of the pipe in each slot
+        self.spawned = 0
+        self.head = 0
+        self.count = 0
+        
+    def slot(self, i):
+        """Slot of the i-th oldest pipe"""
+        return (self.head + i) % self.capacity
+        
+    def push(self, x, height):
+        """Add a pipe at the tail"""
+        if self.count == self.capacity:
+            raise IndexError("pipe ring is full")
+        s = self.slot(self.count)
+        self.x[s] = x
+        self.height[s] = height
+        self.passed[s] = False
+        self.ids[s] = self.spawned
+        self.spawned += 1
+        self.count += 1
+        
+    def pop(self):
+        """Drop the pipe at the head"""
+        self.head = (self.head + 1) % self.capacity
+        self.count -= 1
+        
+    def tail_x(self):
+        """x of the newest pipe"""
+        return self.x[self.slot(self.count - 1)]
+        
+    def advance(self, dx):
+        """Move every pipe horizontally"""
+        x = self.x
+        for i in range(self.count):
+            x[self.slot(i)] += dx
+            
+    def nearest(self, left):
+        """Slot of the oldest pipe whose right edge is still past left, or None"""
+        for i in range(self.count):
+            s = self.slot(i)
+            if self.x[s] + self.width > left:
+                return s
+        return None
+        
+    def first_unpassed(self):
+        """Slot of the oldest pipe the bird has not scored yet, or None"""
+        for i in range(self.count):
+            s = self.slot(i)
+            if not self.passed[s]:
+                return s
+        return None
 
 class FlappyBird:
     def __init__(self):
@@ -8,6 +70,7 @@ class FlappyBird:
         self.root = tk.Tk()
         self.root.title("Flappy Bird")
         self.root.resizable(False, False)
+        self.ticker = TickScheduler(self.root)
         
         # Game constants
         self.WINDOW_WIDTH = 800
@@ -39,21 +102,23 @@ class FlappyBird:
         
         # Game state
         self.reset_game()
+        self.build_scene()
         
         # Bind events
         self.root.bind('<KeyPress-space>', self.jump)
         self.root.bind('<Button-1>', self.jump)  # Mouse click
         self.root.focus_set()
         
-        # Start game loop
-        self.game_loop()
+        # The loop only runs while the bird flies; still screens are drawn once
+        self.redraw_pending = False
+        self.invalidate()
         
     def reset_game(self):
         """Reset game to initial state"""
         self.bird_x = 100
         self.bird_y = self.WINDOW_HEIGHT // 2
         self.bird_velocity = 0
-        self.pipes = []
+        self.pipes = PipeRing(4, self.PIPE_WIDTH)
         self.score = 0
         self.game_over = False
         self.game_started = False
@@ -62,20 +127,18 @@ class FlappyBird:
         for i in range(3):
             pipe_x = self.WINDOW_WIDTH + i * 300
             pipe_height = random.randint(100, self.WINDOW_HEIGHT - self.PIPE_GAP - self.GROUND_HEIGHT - 100)
-            self.pipes.append({
-                'x': pipe_x,
-                'height': pipe_height,
-                'passed': False
-            })
+            self.pipes.push(pipe_x, pipe_height)
     
     def jump(self, event=None):
         """Make bird jump"""
         if self.game_over:
             self.reset_game()
+            self.invalidate()
         else:
             self.bird_velocity = self.JUMP_VELOCITY
             if not self.game_started:
                 self.game_started = True
+                self.game_loop()
     
     def update_bird(self):
         """Update bird position and velocity"""
@@ -98,27 +161,25 @@ class FlappyBird:
         if not self.game_started or self.game_over:
             return
             
-        for pipe in self.pipes:
-            pipe['x'] += self.PIPE_VELOCITY
-            
-            # Check if bird passed the pipe for scoring
-            if not pipe['passed'] and pipe['x'] + self.PIPE_WIDTH < self.bird_x:
-                pipe['passed'] = True
-                self.score += 1
+        pipes = self.pipes
+        pipes.advance(self.PIPE_VELOCITY)
+        
+        # Pipes are passed in order, so only the oldest unscored one can score
+        s = pipes.first_unpassed()
+        if s is not None and pipes.x[s] + self.PIPE_WIDTH < self.bird_x:
+            pipes.passed[s] = True
+            self.score += 1
         
         # Remove pipes that have moved off screen
-        self.pipes = [pipe for pipe in self.pipes if pipe['x'] > -self.PIPE_WIDTH]
+        while pipes.count and pipes.x[pipes.head] <= -self.PIPE_WIDTH:
+            pipes.pop()
         
-        # Add new pipes when needed
-        if len(self.pipes) < 3:
-            last_pipe_x = max(pipe['x'] for pipe in self.pipes) if self.pipes else self.WINDOW_WIDTH
+        # Add new pipes when needed; the newest pipe is always the rightmost
+        if pipes.count < 3:
+            last_pipe_x = pipes.tail_x() if pipes.count else self.WINDOW_WIDTH
             if last_pipe_x < self.WINDOW_WIDTH + 100:
                 pipe_height = random.randint(100, self.WINDOW_HEIGHT - self.PIPE_GAP - self.GROUND_HEIGHT - 100)
-                self.pipes.append({
-                    'x': last_pipe_x + 300,
-                    'height': pipe_height,
-                    'passed': False
-                })
+                pipes.push(last_pipe_x + 300, pipe_height)
     
     def check_collisions(self):
         """Check for collisions between bird and pipes"""
@@ -130,107 +191,157 @@ class FlappyBird:
         bird_top = self.bird_y - self.BIRD_SIZE // 2
         bird_bottom = self.bird_y + self.BIRD_SIZE // 2
         
-        for pipe in self.pipes:
-            pipe_left = pipe['x']
-            pipe_right = pipe['x'] + self.PIPE_WIDTH
+        # Pipes are further apart than the bird is wide, so only the nearest one can touch it
+        s = self.pipes.nearest(bird_left)
+        if s is None:
+            return
+        pipe_left = self.pipes.x[s]
+        pipe_height = self.pipes.height[s]
+        
+        # Check if bird is horizontally aligned with pipe
+        if bird_right > pipe_left:
+            # Check collision with top pipe
+            if bird_top < pipe_height:
+                self.game_over = True
+                return
             
-            # Check if bird is horizontally aligned with pipe
-            if bird_right > pipe_left and bird_left < pipe_right:
-                # Check collision with top pipe
-                if bird_top < pipe['height']:
-                    self.game_over = True
-                    return
-                
-                # Check collision with bottom pipe
-                bottom_pipe_top = pipe['height'] + self.PIPE_GAP
-                if bird_bottom > bottom_pipe_top:
-                    self.game_over = True
-                    return
+            # Check collision with bottom pipe
+            bottom_pipe_top = pipe_height + self.PIPE_GAP
+            if bird_bottom > bottom_pipe_top:
+                self.game_over = True
+                return
+    
+    def build_scene(self):
+        """Create every canvas item once, back to front; frames then only move them"""
+        self.draw_clouds()
+        
+        # Four rectangles per pipe slot, reused by whichever pipe holds the slot
+        self.shown_ring = None
+        self.shown_pipes = [None] * self.pipes.capacity  # (pipe id, x) each slot shows
+        self.pipe_items = [
+            [
+                self.canvas.create_rectangle(
+                    0, 0, 0, 0,
+                    fill=self.PIPE_COLOR,
+                    outline=self.BLACK,
+                    width=2,
+                    state="hidden",
+                    tags=f"pipe{s}"
+                )
+                for _ in range(4)
+            ]
+            for s in range(self.pipes.capacity)
+        ]
+        
+        self.draw_ground()
+        self.draw_bird()
+        self.draw_score()
+        self.shown_screen = None
     
     def draw_bird(self):
-        """Draw the bird with simple animation"""
-        # Calculate rotation based on velocity
-        rotation = max(-30, min(30, self.bird_velocity * 3))
+        """Draw the bird at the middle of the window, tagged so it moves as one"""
+        bird_x = self.bird_x
+        bird_y = self.WINDOW_HEIGHT // 2
+        self.shown_bird_y = bird_y
         
         # Draw bird body (circle)
         self.canvas.create_oval(
-            self.bird_x - self.BIRD_SIZE // 2,
-            self.bird_y - self.BIRD_SIZE // 2,
-            self.bird_x + self.BIRD_SIZE // 2,
-            self.bird_y + self.BIRD_SIZE // 2,
+            bird_x - self.BIRD_SIZE // 2,
+            bird_y - self.BIRD_SIZE // 2,
+            bird_x + self.BIRD_SIZE // 2,
+            bird_y + self.BIRD_SIZE // 2,
             fill=self.BIRD_COLOR,
             outline=self.BLACK,
-            width=2
+            width=2,
+            tags="bird"
         )
         
         # Draw bird eye
-        eye_x = self.bird_x + 5
-        eye_y = self.bird_y - 5
+        eye_x = bird_x + 5
+        eye_y = bird_y - 5
         self.canvas.create_oval(
             eye_x - 3, eye_y - 3,
             eye_x + 3, eye_y + 3,
             fill=self.WHITE,
-            outline=self.BLACK
+            outline=self.BLACK,
+            tags="bird"
         )
         
         # Draw pupil
         self.canvas.create_oval(
             eye_x - 1, eye_y - 1,
             eye_x + 1, eye_y + 1,
-            fill=self.BLACK
+            fill=self.BLACK,
+            tags="bird"
         )
         
         # Draw beak
         beak_points = [
-            self.bird_x + self.BIRD_SIZE // 2, self.bird_y,
-            self.bird_x + self.BIRD_SIZE // 2 + 10, self.bird_y - 3,
-            self.bird_x + self.BIRD_SIZE // 2 + 10, self.bird_y + 3
+            bird_x + self.BIRD_SIZE // 2, bird_y,
+            bird_x + self.BIRD_SIZE // 2 + 10, bird_y - 3,
+            bird_x + self.BIRD_SIZE // 2 + 10, bird_y + 3
         ]
-        self.canvas.create_polygon(beak_points, fill="#FFA500", outline=self.BLACK)
+        self.canvas.create_polygon(beak_points, fill="#FFA500", outline=self.BLACK, tags="bird")
+    
+    def update_bird_items(self):
+        """Move the bird's items to its current height"""
+        if self.bird_y != self.shown_bird_y:
+            self.canvas.move("bird", 0, self.bird_y - self.shown_bird_y)
+            self.shown_bird_y = self.bird_y
     
     def draw_pipes(self):
-        """Draw all pipes"""
-        for pipe in self.pipes:
-            # Top pipe
-            self.canvas.create_rectangle(
-                pipe['x'], 0,
-                pipe['x'] + self.PIPE_WIDTH, pipe['height'],
-                fill=self.PIPE_COLOR,
-                outline=self.BLACK,
-                width=2
-            )
-            
-            # Bottom pipe
-            bottom_pipe_top = pipe['height'] + self.PIPE_GAP
-            self.canvas.create_rectangle(
-                pipe['x'], bottom_pipe_top,
-                pipe['x'] + self.PIPE_WIDTH, self.WINDOW_HEIGHT - self.GROUND_HEIGHT,
-                fill=self.PIPE_COLOR,
-                outline=self.BLACK,
-                width=2
-            )
-            
-            # Pipe caps
-            cap_height = 30
-            cap_width = self.PIPE_WIDTH + 10
-            
-            # Top pipe cap
-            self.canvas.create_rectangle(
-                pipe['x'] - 5, pipe['height'] - cap_height,
-                pipe['x'] + cap_width - 5, pipe['height'],
-                fill=self.PIPE_COLOR,
-                outline=self.BLACK,
-                width=2
-            )
-            
-            # Bottom pipe cap
-            self.canvas.create_rectangle(
-                pipe['x'] - 5, bottom_pipe_top,
-                pipe['x'] + cap_width - 5, bottom_pipe_top + cap_height,
-                fill=self.PIPE_COLOR,
-                outline=self.BLACK,
-                width=2
-            )
+        """Bring the pipe items up to date with the pipe ring"""
+        pipes = self.pipes
+        shown = self.shown_pipes
+        if pipes is not self.shown_ring:
+            # A new game brings a new ring; its slots share nothing with what is shown
+            self.shown_ring = pipes
+            shown[:] = [None] * pipes.capacity
+            for s in range(pipes.capacity):
+                self.canvas.itemconfigure(f"pipe{s}", state="hidden")
+        
+        live = [False] * pipes.capacity
+        for i in range(pipes.count):
+            s = pipes.slot(i)
+            live[s] = True
+            pipe_x = pipes.x[s]
+            current = shown[s]
+            if current is None or current[0] != pipes.ids[s]:
+                # Slot holds a new pipe, place all four rectangles
+                self.place_pipe(s, pipe_x, pipes.height[s])
+            elif current[1] != pipe_x:
+                # Same pipe scrolled, one call moves all four
+                self.canvas.move(f"pipe{s}", pipe_x - current[1], 0)
+            shown[s] = (pipes.ids[s], pipe_x)
+        
+        for s in range(pipes.capacity):
+            if not live[s] and shown[s] is not None:
+                self.canvas.itemconfigure(f"pipe{s}", state="hidden")
+                shown[s] = None
+    
+    def place_pipe(self, s, pipe_x, pipe_height):
+        """Size a slot's rectangles for a pipe and show them"""
+        top, bottom, top_cap, bottom_cap = self.pipe_items[s]
+        bottom_pipe_top = pipe_height + self.PIPE_GAP
+        
+        # Pipe caps
+        cap_height = 30
+        cap_width = self.PIPE_WIDTH + 10
+        
+        self.canvas.coords(top, pipe_x, 0, pipe_x + self.PIPE_WIDTH, pipe_height)
+        self.canvas.coords(
+            bottom, pipe_x, bottom_pipe_top,
+            pipe_x + self.PIPE_WIDTH, self.WINDOW_HEIGHT - self.GROUND_HEIGHT
+        )
+        self.canvas.coords(
+            top_cap, pipe_x - 5, pipe_height - cap_height,
+            pipe_x + cap_width - 5, pipe_height
+        )
+        self.canvas.coords(
+            bottom_cap, pipe_x - 5, bottom_pipe_top,
+            pipe_x + cap_width - 5, bottom_pipe_top + cap_height
+        )
+        self.canvas.itemconfigure(f"pipe{s}", state="normal")
     
     def draw_ground(self):
         """Draw the ground"""
@@ -252,14 +363,19 @@ class FlappyBird:
                 width=2
             )
     
+    def cloud_x(self, cx):
+        """Where a cloud drifted to; clouds move on with the score"""
+        offset = (self.score * 0.5) % 50
+        return (cx - offset) % (self.WINDOW_WIDTH + 100)
+    
     def draw_clouds(self):
-        """Draw background clouds"""
-        cloud_positions = [(150, 100), (400, 80), (650, 120), (200, 200), (500, 180)]
+        """Draw background clouds, one tag per cloud so each moves with a single call"""
+        self.cloud_positions = [(150, 100), (400, 80), (650, 120), (200, 200), (500, 180)]
+        self.shown_clouds = []
         
-        for cx, cy in cloud_positions:
-            # Animate clouds slightly
-            offset = (self.score * 0.5) % 50
-            cloud_x = (cx - offset) % (self.WINDOW_WIDTH + 100)
+        for i, (cx, cy) in enumerate(self.cloud_positions):
+            cloud_x = self.cloud_x(cx)
+            self.shown_clouds.append(cloud_x)
             
             # Draw cloud as multiple overlapping circles
             for dx, dy, size in [(-15, 0, 20), (0, -10, 25), (15, 0, 20), (0, 10, 15)]:
@@ -267,28 +383,46 @@ class FlappyBird:
                     cloud_x + dx - size, cy + dy - size,
                     cloud_x + dx + size, cy + dy + size,
                     fill=self.WHITE,
-                    outline=""
+                    outline="",
+                    tags=f"cloud{i}"
                 )
     
+    def update_clouds(self):
+        """Move clouds whose position changed with the score"""
+        for i, (cx, _) in enumerate(self.cloud_positions):
+            cloud_x = self.cloud_x(cx)
+            if cloud_x != self.shown_clouds[i]:
+                self.canvas.move(f"cloud{i}", cloud_x - self.shown_clouds[i], 0)
+                self.shown_clouds[i] = cloud_x
+    
     def draw_score(self):
         """Draw the current score"""
-        self.canvas.create_text(
-            self.WINDOW_WIDTH // 2, 50,
-            text=f"Score: {self.score}",
-            font=("Arial", 24, "bold"),
-            fill=self.WHITE,
-            anchor="center"
-        )
-        
-        # Add shadow for better visibility
-        self.canvas.create_text(
-            self.WINDOW_WIDTH // 2 + 2, 52,
-            text=f"Score: {self.score}",
-            font=("Arial", 24, "bold"),
-            fill=self.BLACK,
-            anchor="center"
-        )
+        self.shown_score = self.score
+        self.score_items = [
+            self.canvas.create_text(
+                self.WINDOW_WIDTH // 2, 50,
+                text=f"Score: {self.score}",
+                font=("Arial", 24, "bold"),
+                fill=self.WHITE,
+                anchor="center"
+            ),
+            # Add shadow for better visibility
+            self.canvas.create_text(
+                self.WINDOW_WIDTH // 2 + 2, 52,
+                text=f"Score: {self.score}",
+                font=("Arial", 24, "bold"),
+                fill=self.BLACK,
+                anchor="center"
+            ),
+        ]
     
+    def update_score(self):
+        """Change the score text when the score changes"""
+        if self.score != self.shown_score:
+            self.shown_score = self.score
+            for item in self.score_items:
+                self.canvas.itemconfigure(item, text=f"Score: {self.score}")
+        
     def draw_instructions(self):
         """Draw game instructions"""
         if not self.game_started:
@@ -297,7 +431,8 @@ class FlappyBird:
                 text="FLAPPY BIRD",
                 font=("Arial", 32, "bold"),
                 fill=self.WHITE,
-                anchor="center"
+                anchor="center",
+                tags="screen"
             )
             
             self.canvas.create_text(
@@ -305,7 +440,8 @@ class FlappyBird:
                 text="FLAPPY BIRD",
                 font=("Arial", 32, "bold"),
                 fill=self.BLACK,
-                anchor="center"
+                anchor="center",
+                tags="screen"
             )
             
             self.canvas.create_text(
@@ -313,7 +449,8 @@ class FlappyBird:
                 text="Press SPACEBAR or CLICK to jump!",
                 font=("Arial", 16),
                 fill=self.WHITE,
-                anchor="center"
+                anchor="center",
+                tags="screen"
             )
             
             self.canvas.create_text(
@@ -321,7 +458,8 @@ class FlappyBird:
                 text="Press SPACEBAR or CLICK to jump!",
                 font=("Arial", 16),
                 fill=self.BLACK,
-                anchor="center"
+                anchor="center",
+                tags="screen"
             )
     
     def draw_game_over(self):
@@ -331,7 +469,8 @@ class FlappyBird:
             self.canvas.create_rectangle(
                 0, 0, self.WINDOW_WIDTH, self.WINDOW_HEIGHT,
                 fill=self.BLACK,
-                stipple="gray25"
+                stipple="gray25",
+                tags="screen"
             )
             
             # Game over text
@@ -340,7 +479,8 @@ class FlappyBird:
                 text="GAME OVER",
                 font=("Arial", 36, "bold"),
                 fill="#FF4444",
-                anchor="center"
+                anchor="center",
+                tags="screen"
             )
             
             self.canvas.create_text(
@@ -348,7 +488,8 @@ class FlappyBird:
                 text=f"Final Score: {self.score}",
                 font=("Arial", 20),
                 fill=self.WHITE,
-                anchor="center"
+                anchor="center",
+                tags="screen"
             )
             
             self.canvas.create_text(
@@ -356,30 +497,37 @@ class FlappyBird:
                 text="Press SPACEBAR or CLICK to restart",
                 font=("Arial", 16),
                 fill=self.WHITE,
-                anchor="center"
+                anchor="center",
+                tags="screen"
             )
     
     def draw_everything(self):
-        """Draw all game elements"""
-        # Clear canvas
-        self.canvas.delete("all")
-        
-        # Draw background elements
-        self.draw_clouds()
-        
-        # Draw game elements
+        """Bring the canvas up to date, moving items instead of recreating them"""
+        self.update_clouds()
         self.draw_pipes()
-        self.draw_ground()
-        self.draw_bird()
+        self.update_bird_items()
+        self.update_score()
         
-        # Draw UI elements
-        self.draw_score()
-        
-        if not self.game_started:
-            self.draw_instructions()
-        
-        if self.game_over:
-            self.draw_game_over()
+        # Start and game over screens are drawn on top when the screen changes
+        screen = 'over' if self.game_over else 'play' if self.game_started else 'start'
+        if screen != self.shown_screen:
+            self.shown_screen = screen
+            self.canvas.delete("screen")
+            if not self.game_started:
+                self.draw_instructions()
+            if self.game_over:
+                self.draw_game_over()
+    
+    def invalidate(self):
+        """Redraw once pending events are handled, for screens where nothing moves"""
+        if not self.redraw_pending:
+            self.redraw_pending = True
+            self.root.after_idle(self.redraw)
+    
+    def redraw(self):
+        """Draw a frame requested by invalidate"""
+        self.redraw_pending = False
+        self.draw_everything()
     
     def game_loop(self):
         """Main game loop"""
@@ -390,8 +538,11 @@ class FlappyBird:
         
         self.draw_everything()
         
-        # Schedule next frame
-        self.root.after(16, self.game_loop)  # ~60 FPS
+        # Schedule next frame while the bird is flying, otherwise sleep until a jump
+        if self.game_started and not self.game_over:
+            self.ticker.schedule(self.game_loop, 16)  # ~60 FPS
+        else:
+            self.ticker.reset()
     
     def run(self):
         """Start the game"""
@@ -0,0 +1,165 @@
+"""
+Leaderboard
+High score history for the snake and space shooter games, kept in SQLite.
+
+Every game ever played is stored, per player and mode. Scores are indexed
+so top-N lists and ranks are answered from the index instead of sorting in
+Python. Games are submitted from the UI thread into a queue; a background
+thread writes everything pending in one transaction, and WAL mode lets the
+UI keep reading while it does.
+"""
+
+import getpass
+import json
+import os
+import queue
+import sqlite3
+import sys
+import threading
+import time
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scores (
+    id INTEGER PRIMARY KEY,
+    game TEXT NOT NULL,
+    mode TEXT NOT NULL,
+    player TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    played_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS scores_by_score ON scores (game, mode, score DESC);
+CREATE INDEX IF NOT EXISTS scores_by_player ON scores (game, mode, player, score DESC);
+"""
+
+# Tries per batch before its games are held back for the next one
+WRITE_ATTEMPTS = 3
+
+
+def default_player():
+    """Name of the logged-in user, used when no player name is given"""
+    try:
+        return getpass.getuser()
+    except Exception:
+        return 'player'
+
+
+class Leaderboard:
+    """Scores of one game, with writes batched on a background thread"""
+
+    def __init__(self, path, game, legacy_json=None, player=None, legacy_mode='classic'):
+        self.path = path
+        self.game = game
+        self.player = player or default_player()
+
+        # Readers use this connection on the UI thread, the writer has its own
+        self.db = sqlite3.connect(path)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.executescript(SCHEMA)
+        if legacy_json:
+            self.import_json(legacy_json, legacy_mode)
+
+        self.pending = queue.Queue()
+        self.writer = threading.Thread(target=self.write_loop, daemon=True)
+        self.writer.start()
+
+    def import_json(self, path, mode='classic'):
+        """Bring over a top-10 list from the old JSON file, once"""
+        count = self.db.execute("SELECT COUNT(*) FROM scores WHERE game = ?", (self.game,)).fetchone()[0]
+        if count or not os.path.exists(path):
+            return
+        try:
+            with open(path, 'r') as f:
+                scores = [int(score) for score in json.load(f) if score]
+        except (OSError, ValueError, TypeError):
+            return
+        with self.db:
+            self.db.executemany(
+                "INSERT INTO scores (game, mode, player, score, played_at) VALUES (?, ?, ?, ?, ?)",
+                [(self.game, mode, self.player, score, os.path.getmtime(path)) for score in scores]
+            )
+
+    def submit(self, score, mode='classic', player=None):
+        """Queue a finished game; returns immediately"""
+        self.pending.put((self.game, mode, player or self.player, score, time.time()))
+
+    def write_loop(self):
+        """Insert queued games, everything that has piled up in one transaction"""
+        db = sqlite3.connect(self.path)
+        db.execute("PRAGMA synchronous=NORMAL")
+        # Games a failed transaction could not write, tried again with the next batch
+        unsaved = []
+        while True:
+            rows = [self.pending.get()]
+            while True:
+                try:
+                    rows.append(self.pending.get_nowait())
+                except queue.Empty:
+                    break
+            stop = None in rows
+            count = len(rows)
+            rows = unsaved + [row for row in rows if row is not None]
+            unsaved = self.write_rows(db, rows)
+            if unsaved:
+                print(f"Leaderboard: could not save {len(unsaved)} score(s) to {self.path}, "
+                      f"{'giving up' if stop else 'will retry'}", file=sys.stderr)
+            for _ in range(count):
+                self.pending.task_done()
+            if stop:
+                db.close()
+                return
+
+    def write_rows(self, db, rows, attempts=WRITE_ATTEMPTS):
+        """Insert rows in one transaction, retrying e.g. a locked database; returns the rows not written"""
+        for attempt in range(attempts):
+            try:
+                with db:
+                    db.executemany(
+                        "INSERT INTO scores (game, mode, player, score, played_at) VALUES (?, ?, ?, ?, ?)",
+                        rows
+                    )
+                return []
+            except sqlite3.Error as e:
+                # The failed transaction was rolled back, so nothing is written twice
+                print(f"Leaderboard: write failed ({e})", file=sys.stderr)
+                if attempt + 1 < attempts:
+                    time.sleep(0.1 * 2 ** attempt)
+        return rows
+
+    def flush(self):
+        """Wait until every submitted game has been written"""
+        self.pending.join()
+
+    def close(self):
+        """Write what is pending and stop the writer"""
+        if self.writer.is_alive():
+            self.pending.put(None)
+            self.writer.join()
+        self.db.close()
+
+    def top(self, n=10, mode='classic', player=None):
+        """Best n (player, score) pairs, optionally for one player"""
+        if player is None:
+            return self.db.execute(
+                "SELECT player, score FROM scores WHERE game = ? AND mode = ? "
+                "ORDER BY score DESC LIMIT ?", (self.game, mode, n)
+            ).fetchall()
+        return self.db.execute(
+            "SELECT player, score FROM scores WHERE game = ? AND mode = ? AND player = ? "
+            "ORDER BY score DESC LIMIT ?", (self.game, mode, player, n)
+        ).fetchall()
+
+    def rank(self, score, mode='classic'):
+        """Position a score would take on the board, 1 being the best"""
+        better = self.db.execute(
+            "SELECT COUNT(*) FROM scores WHERE game = ? AND mode = ? AND score > ?",
+            (self.game, mode, score)
+        ).fetchone()[0]
+        return better + 1
+
+    def best(self, mode='classic', player=None):
+        """Highest score for a player, or 0 if they have not played"""
+        row = self.db.execute(
+            "SELECT MAX(score) FROM scores WHERE game = ? AND mode = ? AND player = ?",
+            (self.game, mode, player or self.player)
+        ).fetchone()
+        return row[0] or 0
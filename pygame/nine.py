@@ -12,8 +12,7 @@ import time
 from enum import Enum
 from dataclasses import dataclass
 from typing import List, Tuple, Optional
-import json
-import os
+from leaderboard import Leaderboard
 
 class GameState(Enum):
     MENU = "menu"
@@ -185,7 +184,7 @@ class SpaceShooter:
         self.level = 1
         self.lives = 3
         self.wave = 1
-        self.high_scores = self.load_high_scores()
+        self.leaderboard = Leaderboard('space_shooter_scores.db', 'space_shooter', legacy_json='space_shooter_scores.json')
         
         # Game objects
         self.player = Player(Vector2(self.WIDTH // 2, self.HEIGHT - 50))
@@ -426,8 +425,8 @@ class SpaceShooter:
         )
         title.pack(pady=20)
         
-        for i, score in enumerate(self.high_scores[:10], 1):
-            score_text = f"{i:2d}. {score:8d} pts"
+        for i, (player, score) in enumerate(self.leaderboard.top(10), 1):
+            score_text = f"{i:2d}. {player[:10]:<10} {score:8d} pts"
             score_label = tk.Label(
                 scores_window,
                 text=score_text,
@@ -715,29 +714,8 @@ class SpaceShooter:
         
     def update_high_scores(self):
         """Update high scores"""
-        self.high_scores.append(self.score)
-        self.high_scores.sort(reverse=True)
-        self.high_scores = self.high_scores[:10]
-        self.save_high_scores()
+        self.leaderboard.submit(self.score)
         
-    def load_high_scores(self):
-        """Load high scores from file"""
-        try:
-            if os.path.exists('space_shooter_scores.json'):
-                with open('space_shooter_scores.json', 'r') as f:
-                    return json.load(f)
-        except:
-            pass
-        return [0] * 10
-        
-    def save_high_scores(self):
-        """Save high scores to file"""
-        try:
-            with open('space_shooter_scores.json', 'w') as f:
-                json.dump(self.high_scores, f)
-        except:
-            pass
-            
     def play_sound(self, sound_type: str):
         """Play sound effects using system bell"""
         try:
@@ -1067,6 +1045,7 @@ class SpaceShooter:
         print("\nDefend Earth from the alien invasion!")
         
         self.root.mainloop()
+        self.leaderboard.close()
 
 def main():
     """Main function to run the space shooter"""
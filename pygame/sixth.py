@@ -1,97 +1,331 @@
 import tkinter as tk
+from collections import deque
+import functools
+import itertools
 import random
+import sys
 import time
+from typing import NamedTuple, Tuple
+from tick_scheduler import TickScheduler
 
-class TetrisGame:
-    def __init__(self):
-        # Game window setup
-        self.root = tk.Tk()
-        self.root.title("Tetris")
-        self.root.resizable(False, False)
+class Rotation(NamedTuple):
+    """One rotation of a tetromino, compiled from its string rows"""
+    cells: Tuple[Tuple[int, int], ...]  # (dx, dy) offsets of the filled cells
+    masks: Tuple[Tuple[int, int], ...]  # (dy, row bitmask) with bit 0 at column `left`
+    left: int                           # leftmost and rightmost filled column
+    right: int
+    bottom: int                         # lowest filled row
+    profile: Tuple[Tuple[int, int], ...]  # (dx, lowest dy) for each filled column
+
+class Piece(NamedTuple):
+    type: str
+    rotation: int
+    x: int
+    y: int
+
+def compile_rotations(shapes):
+    """Turn every rotation's string rows into offsets and row bitmasks, once"""
+    compiled = {}
+    for piece_type, rotations in shapes.items():
+        compiled[piece_type] = []
+        for rows in rotations:
+            cells = tuple((dx, dy) for dy, row in enumerate(rows)
+                          for dx, cell in enumerate(row) if cell != '.')
+            left = min(dx for dx, _ in cells)
+            masks = {}
+            lowest = {}
+            for dx, dy in cells:
+                masks[dy] = masks.get(dy, 0) | 1 << (dx - left)
+                lowest[dx] = max(lowest.get(dx, dy), dy)
+            compiled[piece_type].append(Rotation(
+                cells, tuple(sorted(masks.items())), left,
+                max(dx for dx, _ in cells), max(dy for _, dy in cells),
+                tuple(sorted(lowest.items()))
+            ))
+        compiled[piece_type] = tuple(compiled[piece_type])
+    return compiled
+
+@functools.lru_cache(maxsize=None)
+def zobrist_keys(width, height, preview=8):
+    """Random 64-bit keys for hashing positions
+    
+    row_keys[y][mask] is the XOR of the keys of the cells set in mask, so a row
+    hashes with one lookup; piece_keys[i][type] stands for the i-th queued piece,
+    for queues of up to preview pieces. The keys come from one fixed stream, so
+    tables of different preview lengths agree on the keys they share.
+    """
+    rng = random.Random(0x7e7215)  # fixed, so hashes agree between runs and processes
+    row_keys = []
+    for _ in range(height):
+        cells = [rng.getrandbits(64) for _ in range(width)]
+        keys = [0] * (1 << width)
+        for mask in range(1, 1 << width):
+            low = mask & -mask
+            keys[mask] = keys[mask ^ low] ^ cells[low.bit_length() - 1]
+        row_keys.append(keys)
+    piece_keys = [{piece_type: rng.getrandbits(64) for piece_type in 'IOTSZJL'}
+                  for _ in range(preview)]
+    return row_keys, piece_keys
+
+class PieceGenerator:
+    """Seedable stream of piece types, drawn uniformly or from shuffled 7-piece bags
+    
+    Pieces are generated ahead into a buffer, so whole queues can be made in
+    one go; snapshot() and restore() save and rewind the stream.
+    """
+    
+    def __init__(self, types, mode='uniform', seed=None, rng=None):
+        if mode not in ('uniform', 'bag'):
+            raise ValueError(f"unknown piece generator mode {mode!r}")
+        self.types = list(types)
+        self.mode = mode
+        self.rng = rng or random.Random(seed)
+        self.buffer = deque()
+        
+    def fill(self, count):
+        """Generate pieces until at least count are buffered"""
+        buffer = self.buffer
+        rng = self.rng
+        while len(buffer) < count:
+            if self.mode == 'bag':
+                # Every type once per bag, so droughts last at most 12 pieces
+                bag = list(self.types)
+                rng.shuffle(bag)
+                buffer.extend(bag)
+            else:
+                buffer.extend([rng.choice(self.types) for _ in range(count - len(buffer))])
+                
+    def next(self):
+        """Take the next piece type"""
+        if not self.buffer:
+            self.fill(1)
+        return self.buffer.popleft()
+        
+    def take(self, count):
+        """Take the next count piece types as a list"""
+        self.fill(count)
+        buffer = self.buffer
+        return [buffer.popleft() for _ in range(count)]
+        
+    def peek(self, count):
+        """The next count piece types, without taking them"""
+        self.fill(count)
+        return list(itertools.islice(self.buffer, count))
+        
+    def snapshot(self):
+        """State to hand to restore() to replay the stream from here"""
+        return self.rng.getstate(), tuple(self.buffer)
+        
+    def restore(self, state):
+        """Rewind or fast-forward to a snapshot"""
+        rng_state, buffered = state
+        self.rng.setstate(rng_state)
+        self.buffer = deque(buffered)
+
+class TetrisBoard:
+    """Locked cells as one bitmask per row, plus a parallel plane of piece types for drawing"""
+    
+    def __init__(self, width, height, preview=8):
+        self.width = width
+        self.height = height
+        self.full_row = (1 << width) - 1
+        # Bit x of rows[y] is set when cell (x, y) is filled
+        self.rows = [0] * height
+        self.colors = [[None] * width for _ in range(height)]
+        # Bumped on every change, so renderers can tell when to look again
+        self.version = 0
+        # Row of the highest locked cell in each column, height when empty
+        self.tops = [height] * width
+        # Zobrist hash of the locked cells, kept up to date on every change;
+        # key() can fold in queues of up to preview pieces
+        self.row_keys, self.piece_keys = zobrist_keys(width, height, preview)
+        self.hash = 0
+        
+    def is_filled(self, x, y):
+        """Check whether a locked cell fills (x, y)"""
+        return self.rows[y] >> x & 1 == 1
+        
+    def collides(self, rotation, x, y):
+        """Check whether a piece rotation at (x, y) leaves the well or overlaps a locked cell"""
+        left = x + rotation.left
+        if left < 0 or x + rotation.right >= self.width or y + rotation.bottom >= self.height:
+            return True
+        rows = self.rows
+        for dy, mask in rotation.masks:
+            row = y + dy
+            if row >= 0 and rows[row] & (mask << left):
+                return True
+        return False
         
+    def drop_row(self, rotation, x, y):
+        """Row a piece at (x, y) comes to rest on when dropped straight down"""
+        tops = self.tops
+        land = self.height
+        for dx, dy in rotation.profile:
+            row = tops[x + dx] - 1 - dy
+            if row < land:
+                land = row
+        if land >= y:
+            return land
+        
+        # Tucked under an overhang, the surface says nothing about what is below
+        while not self.collides(rotation, x, y + 1):
+            y += 1
+        return y
+        
+    def place(self, cells, piece_type):
+        """Lock a piece's cells into the board"""
+        self.version += 1
+        tops = self.tops
+        for x, y in cells:
+            if y >= 0:
+                self.hash ^= self.row_keys[y][1 << x]
+                self.rows[y] |= 1 << x
+                self.colors[y][x] = piece_type
+                if y < tops[x]:
+                    tops[x] = y
+                
+    def clear_lines(self):
+        """Remove full rows and shift the rest down, returns how many were removed"""
+        full = self.full_row
+        old = self.rows
+        if full not in old:
+            return 0
+        kept = [y for y, row in enumerate(old) if row != full]
+        cleared = self.height - len(kept)
+        self.version += 1
+        self.rows = rows = [0] * cleared + [old[y] for y in kept]
+        self.colors = [[None] * self.width for _ in range(cleared)] + [self.colors[y] for y in kept]
+        
+        # Only rows from the top of the stack down to the lowest cleared line
+        # change: the ones above a cleared line shift down, those below stay put.
+        # Empty rows hash to 0, so the rows above the stack can be skipped.
+        row_keys = self.row_keys
+        top = min(self.tops)
+        lowest = max(y for y in range(top, self.height) if old[y] == full)
+        h = self.hash
+        for y in range(top, lowest + 1):
+            h ^= row_keys[y][old[y]] ^ row_keys[y][rows[y]]
+        self.hash = h
+        self.update_tops()
+        return cleared
+        
+    def update_tops(self):
+        """Recompute the column tops from the rows"""
+        tops = self.tops = [self.height] * self.width
+        pending = self.full_row
+        for y, row in enumerate(self.rows):
+            found = row & pending
+            while found:
+                bit = found & -found
+                tops[bit.bit_length() - 1] = y
+                found ^= bit
+            pending &= ~row
+            if not pending:
+                break
+        
+    def copy(self):
+        """Independent copy, for trying out placements"""
+        board = TetrisBoard.__new__(TetrisBoard)
+        board.width = self.width
+        board.height = self.height
+        board.full_row = self.full_row
+        board.rows = list(self.rows)
+        board.colors = [list(row) for row in self.colors]
+        board.tops = list(self.tops)
+        board.version = self.version
+        board.row_keys = self.row_keys
+        board.piece_keys = self.piece_keys
+        board.hash = self.hash
+        return board
+        
+    def key(self, queue=()):
+        """Zobrist hash of the board together with the types of the pieces still to come"""
+        if len(queue) > len(self.piece_keys):
+            raise ValueError(f"queue of {len(queue)} pieces is longer than the {len(self.piece_keys)} "
+                             f"the board's hash keys cover")
+        key = self.hash
+        for i, piece_type in enumerate(queue):
+            key ^= self.piece_keys[i][piece_type]
+        return key
+
+class TileCache:
+    """Each cell look rendered once into a PhotoImage, so a cell is one image item"""
+    
+    def __init__(self, master, size):
+        self.master = master
+        self.size = size
+        self.tiles = {}
+        
+    def get(self, style):
+        """Image for ('solid', color) or ('ghost', color), made on first use"""
+        tile = self.tiles.get(style)
+        if tile is None:
+            tile = self.tiles[style] = self.render(*style)
+        return tile
+        
+    def render(self, kind, color):
+        """Paint one tile; pixels never put stay transparent, so the grid shows through"""
+        size = self.size
+        tile = tk.PhotoImage(master=self.master, width=size, height=size)
+        if kind == 'ghost':
+            # Two pixel outline with every other pixel left out, like stipple gray50
+            dots = [(x, y) for y in range(2, size - 2) for x in range(2, size - 2)
+                    if (x + y) % 2 == 0 and (min(x, y) < 4 or max(x, y) >= size - 4)]
+            for x, y in dots:
+                tile.put(color, to=(x, y))
+        else:
+            # Block with a white outline and a highlight along the top and left for 3D effect
+            tile.put("#ffffff", to=(1, 1, size - 1, size - 1))
+            tile.put(color, to=(2, 2, size - 2, size - 2))
+            tile.put("#ffffff", to=(1, 1, size - 1, 3))
+            tile.put("#ffffff", to=(1, 1, 3, size - 1))
+        return tile
+
+class TetrisEngine:
+    """Rules of Tetris without any UI, so games can run headless"""
+    # Tetromino shapes
+    SHAPES = {
+        'I': [['....', 'IIII', '....', '....']],
+        'O': [['OO', 'OO']],
+        'T': [['...', 'TTT', '.T.'], ['.T.', 'TT.', '.T.'], ['.T.', 'TTT', '...'], ['.T.', '.TT', '.T.']],
+        'S': [['...', '.SS', 'SS.'], ['S..', 'SS.', '.S.']],
+        'Z': [['...', 'ZZ.', '.ZZ'], ['.Z.', 'ZZ.', 'Z..']],
+        'J': [['...', 'JJJ', '..J'], ['JJ.', 'J..', 'J..'], ['J..', 'JJJ', '...'], ['.J.', '.J.', 'JJ.']],
+        'L': [['...', 'LLL', 'L..'], ['L..', 'L..', 'LL.'], ['..L', 'LLL', '...'], ['LL.', '.L.', '.L.']]
+    }
+    
+    def __init__(self, seed=None, rng=None, mode='uniform'):
         # Game constants
         self.GRID_WIDTH = 10
         self.GRID_HEIGHT = 20
-        self.CELL_SIZE = 30
-        self.CANVAS_WIDTH = self.GRID_WIDTH * self.CELL_SIZE
-        self.CANVAS_HEIGHT = self.GRID_HEIGHT * self.CELL_SIZE
-        self.SIDEBAR_WIDTH = 200
-        self.TOTAL_WIDTH = self.CANVAS_WIDTH + self.SIDEBAR_WIDTH
+        self.ROTATIONS = compile_rotations(self.SHAPES)
         
-        # Colors
-        self.BG_COLOR = "#1a1a2e"
-        self.GRID_COLOR = "#16213e"
-        self.BORDER_COLOR = "#374151"
-        self.TEXT_COLOR = "#ffffff"
-        self.GHOST_COLOR = "#4a5568"
-        
-        # Tetromino colors
-        self.COLORS = {
-            'I': "#00f5ff",  # Cyan
-            'O': "#ffff00",  # Yellow
-            'T': "#800080",  # Purple
-            'S': "#00ff00",  # Green
-            'Z': "#ff0000",  # Red
-            'J': "#0000ff",  # Blue
-            'L': "#ffa500"   # Orange
-        }
-        
-        # Tetromino shapes
-        self.SHAPES = {
-            'I': [['....', 'IIII', '....', '....']],
-            'O': [['OO', 'OO']],
-            'T': [['...', 'TTT', '.T.'], ['.T.', 'TT.', '.T.'], ['.T.', 'TTT', '...'], ['.T.', '.TT', '.T.']],
-            'S': [['...', '.SS', 'SS.'], ['S..', 'SS.', '.S.']],
-            'Z': [['...', 'ZZ.', '.ZZ'], ['.Z.', 'ZZ.', 'Z..']],
-            'J': [['...', 'JJJ', '..J'], ['JJ.', 'J..', 'J..'], ['J..', 'JJJ', '...'], ['.J.', '.J.', 'JJ.']],
-            'L': [['...', 'LLL', 'L..'], ['L..', 'L..', 'LL.'], ['..L', 'LLL', '...'], ['LL.', '.L.', '.L.']]
-        }
-        
-        # Create canvas
-        self.canvas = tk.Canvas(
-            self.root,
-            width=self.TOTAL_WIDTH,
-            height=self.CANVAS_HEIGHT,
-            bg=self.BG_COLOR,
-            highlightthickness=0
-        )
-        self.canvas.pack()
-        
-        # Game state
+        # Pieces are drawn from rng, or from a generator seeded with seed
+        self.generator = PieceGenerator(self.SHAPES, mode, seed, rng)
         self.reset_game()
         
-        # Bind events
-        self.root.bind('<KeyPress>', self.on_key_press)
-        self.root.focus_set()
-        
-        # Start game loop
-        self.game_loop()
-        
     def reset_game(self):
         """Reset game to initial state"""
-        self.grid = [[None for _ in range(self.GRID_WIDTH)] for _ in range(self.GRID_HEIGHT)]
+        self.board = TetrisBoard(self.GRID_WIDTH, self.GRID_HEIGHT)
         self.score = 0
         self.level = 1
         self.lines_cleared = 0
         self.game_over = False
-        self.game_started = False
-        self.drop_time = 0
         self.drop_interval = 500  # milliseconds
+        self.pieces = 0
+        self.line_clears = [0] * 5  # how many times 0, 1, 2, 3 and 4 lines went at once
         
         self.current_piece = None
+        self.ghost_piece = None  # cached ghost and the piece it belongs to
+        self.ghost_for = None
         self.next_piece = self.get_random_piece()
         self.spawn_piece()
         
     def get_random_piece(self):
         """Get a random tetromino piece"""
-        piece_type = random.choice(list(self.SHAPES.keys()))
-        return {
-            'type': piece_type,
-            'shape': self.SHAPES[piece_type][0],
-            'rotation': 0,
-            'x': self.GRID_WIDTH // 2 - 2,
-            'y': 0
-        }
+        piece_type = self.generator.next()
+        return Piece(piece_type, 0, self.GRID_WIDTH // 2 - 2, 0)
     
     def spawn_piece(self):
         """Spawn a new piece"""
@@ -104,52 +338,26 @@ class TetrisGame:
     
     def get_piece_cells(self, piece):
         """Get the cells occupied by a piece"""
-        cells = []
-        shape = self.SHAPES[piece['type']][piece['rotation']]
-        
-        for row_idx, row in enumerate(shape):
-            for col_idx, cell in enumerate(row):
-                if cell != '.':
-                    x = piece['x'] + col_idx
-                    y = piece['y'] + row_idx
-                    cells.append((x, y))
-        
-        return cells
+        rotation = self.ROTATIONS[piece.type][piece.rotation]
+        return [(piece.x + dx, piece.y + dy) for dx, dy in rotation.cells]
     
     def check_collision(self, piece, dx, dy):
         """Check if piece would collide at new position"""
-        test_piece = piece.copy()
-        test_piece['x'] += dx
-        test_piece['y'] += dy
-        
-        cells = self.get_piece_cells(test_piece)
-        
-        for x, y in cells:
-            # Check boundaries
-            if x < 0 or x >= self.GRID_WIDTH or y >= self.GRID_HEIGHT:
-                return True
-            
-            # Check collision with placed pieces
-            if y >= 0 and self.grid[y][x] is not None:
-                return True
-        
-        return False
+        rotation = self.ROTATIONS[piece.type][piece.rotation]
+        return self.board.collides(rotation, piece.x + dx, piece.y + dy)
     
     def rotate_piece(self, piece):
         """Rotate piece clockwise"""
-        new_piece = piece.copy()
-        max_rotations = len(self.SHAPES[piece['type']])
-        new_piece['rotation'] = (piece['rotation'] + 1) % max_rotations
-        new_piece['shape'] = self.SHAPES[piece['type']][new_piece['rotation']]
-        
-        return new_piece
+        max_rotations = len(self.ROTATIONS[piece.type])
+        return piece._replace(rotation=(piece.rotation + 1) % max_rotations)
     
     def move_piece(self, dx, dy):
         """Move current piece if possible"""
         if self.current_piece and not self.game_over:
             if not self.check_collision(self.current_piece, dx, dy):
-                self.current_piece['x'] += dx
-                self.current_piece['y'] += dy
+                self.current_piece = self.current_piece._replace(
+                    x=self.current_piece.x + dx, y=self.current_piece.y + dy
+                )
                 return True
         return False
     
@@ -167,12 +375,8 @@ class TetrisGame:
         if not self.current_piece:
             return
             
-        cells = self.get_piece_cells(self.current_piece)
-        piece_type = self.current_piece['type']
-        
-        for x, y in cells:
-            if y >= 0:
-                self.grid[y][x] = piece_type
+        self.board.place(self.get_piece_cells(self.current_piece), self.current_piece.type)
+        self.pieces += 1
         
         # Check for completed lines
         self.clear_lines()
@@ -182,19 +386,10 @@ class TetrisGame:
     
     def clear_lines(self):
         """Clear completed lines and update score"""
-        lines_to_clear = []
-        
-        for y in range(self.GRID_HEIGHT):
-            if all(cell is not None for cell in self.grid[y]):
-                lines_to_clear.append(y)
-        
-        # Remove completed lines
-        for y in sorted(lines_to_clear, reverse=True):
-            del self.grid[y]
-            self.grid.insert(0, [None for _ in range(self.GRID_WIDTH)])
+        lines_count = self.board.clear_lines()
+        self.line_clears[lines_count] += 1
         
         # Update score and level
-        lines_count = len(lines_to_clear)
         if lines_count > 0:
             # Scoring system
             line_scores = {1: 100, 2: 300, 3: 500, 4: 800}
@@ -215,19 +410,109 @@ class TetrisGame:
     def hard_drop(self):
         """Drop piece to bottom instantly"""
         if self.current_piece and not self.game_over:
-            while self.move_piece(0, 1):
-                self.score += 2  # Bonus points for hard drop
+            ghost = self.get_ghost_piece()
+            self.score += 2 * (ghost.y - self.current_piece.y)  # Bonus points for hard drop
+            self.current_piece = ghost
+    
+    def place_piece(self, rotation, x):
+        """Turn and move the current piece to a column if it fits there, then drop and lock it"""
+        if self.current_piece and not self.game_over:
+            target = self.current_piece._replace(rotation=rotation, x=x)
+            if not self.check_collision(target, 0, 0):
+                self.current_piece = target
+            self.hard_drop()
+            self.drop_piece()
     
     def get_ghost_piece(self):
         """Get ghost piece position (where piece would land)"""
         if not self.current_piece:
             return None
             
-        ghost = self.current_piece.copy()
-        while not self.check_collision(ghost, 0, 1):
-            ghost['y'] += 1
+        # Pieces are immutable, so the same piece object means the same ghost
+        piece = self.current_piece
+        if piece is not self.ghost_for:
+            rotation = self.ROTATIONS[piece.type][piece.rotation]
+            self.ghost_piece = piece._replace(y=self.board.drop_row(rotation, piece.x, piece.y))
+            self.ghost_for = piece
+        
+        return self.ghost_piece
+
+class TetrisGame(TetrisEngine):
+    """Tkinter front end: drawing, keyboard control and the gravity timer"""
+    
+    def __init__(self, seed=None, rng=None, mode='uniform'):
+        super().__init__(seed, rng, mode)
+        
+        # Game window setup
+        self.root = tk.Tk()
+        self.root.title("Tetris")
+        self.root.resizable(False, False)
+        self.ticker = TickScheduler(self.root)
+        self.ai = None  # created when the autopilot is first switched on
+        
+        # Display constants
+        self.CELL_SIZE = 30
+        self.CANVAS_WIDTH = self.GRID_WIDTH * self.CELL_SIZE
+        self.CANVAS_HEIGHT = self.GRID_HEIGHT * self.CELL_SIZE
+        self.SIDEBAR_WIDTH = 200
+        self.TOTAL_WIDTH = self.CANVAS_WIDTH + self.SIDEBAR_WIDTH
+        
+        # Colors
+        self.BG_COLOR = "#1a1a2e"
+        self.GRID_COLOR = "#16213e"
+        self.BORDER_COLOR = "#374151"
+        self.TEXT_COLOR = "#ffffff"
+        self.GHOST_COLOR = "#4a5568"
+        
+        # Tetromino colors
+        self.COLORS = {
+            'I': "#00f5ff",  # Cyan
+            'O': "#ffff00",  # Yellow
+            'T': "#800080",  # Purple
+            'S': "#00ff00",  # Green
+            'Z': "#ff0000",  # Red
+            'J': "#0000ff",  # Blue
+            'L': "#ffa500"   # Orange
+        }
+        
+        # Create canvas
+        self.canvas = tk.Canvas(
+            self.root,
+            width=self.TOTAL_WIDTH,
+            height=self.CANVAS_HEIGHT,
+            bg=self.BG_COLOR,
+            highlightthickness=0
+        )
+        self.canvas.pack()
+        self.build_scene()
+        
+        # Bind events
+        self.root.bind('<KeyPress>', self.on_key_press)
+        self.root.focus_set()
+        
+        # Parts of the window that need redrawing; nothing runs until they do
+        self.dirty = set()
+        self.redraw_pending = False
+        self.invalidate()
+        
+    def reset_game(self):
+        """Reset game to initial state, back on the start screen"""
+        super().reset_game()
+        self.game_started = False
+        self.autopilot = False
         
-        return ghost
+    def autopilot_move(self):
+        """Let the AI place the current piece and drop it"""
+        if self.ai is None:
+            # tetris_ai imports this module, so it is loaded on first use
+            from tetris_ai import TetrisAI
+            self.ai = TetrisAI(self.ROTATIONS, self.GRID_WIDTH, self.GRID_HEIGHT)
+        
+        move = self.ai.best_placement(self.board, self.current_piece.type, self.next_piece.type)
+        if move is None:
+            self.drop_piece()
+        else:
+            self.place_piece(*move)
     
     def on_key_press(self, event):
         """Handle keyboard input"""
@@ -236,10 +521,16 @@ class TetrisGame:
         if self.game_over:
             if key in ['space', 'return']:
                 self.reset_game()
+                self.invalidate()
             return
         
         if not self.game_started:
+            # Gravity only runs while a game is in progress
             self.game_started = True
+            self.invalidate('screen')
+            self.ticker.schedule(self.game_loop, self.drop_interval)
+        
+        self.invalidate('well', 'sidebar')
         
         # Movement controls
         if key in ['left', 'a']:
@@ -253,45 +544,74 @@ class TetrisGame:
             self.rotate_current_piece()
         elif key == 'q':
             self.hard_drop()
+        elif key == 'b':
+            self.autopilot = not self.autopilot
     
-    def draw_cell(self, x, y, color, alpha=1.0):
-        """Draw a single cell"""
-        pixel_x = x * self.CELL_SIZE
-        pixel_y = y * self.CELL_SIZE
+    def build_scene(self):
+        """Create every canvas item once; frames then only reconfigure them"""
+        self.draw_grid()
+        self.draw_controls()
         
-        if alpha < 1.0:
-            # Draw ghost piece with transparency effect
-            self.canvas.create_rectangle(
-                pixel_x + 2, pixel_y + 2,
-                pixel_x + self.CELL_SIZE - 2, pixel_y + self.CELL_SIZE - 2,
-                fill="",
-                outline=color,
-                width=2,
-                stipple="gray50"
+        self.create_cell_items()
+        # Style each cell currently shows: None, ('solid', color) or ('ghost', color)
+        self.cell_styles = [[None] * self.GRID_WIDTH for _ in range(self.GRID_HEIGHT)]
+        self.piece_cells = set()
+        self.shown_board = None
+        self.shown_version = None
+        
+        # Next piece preview
+        start_x = self.CANVAS_WIDTH + 20
+        start_y = 100
+        self.canvas.create_rectangle(
+            start_x - 10, start_y - 10,
+            start_x + 120, start_y + 120,
+            fill=self.BG_COLOR,
+            outline=self.BORDER_COLOR,
+            width=2
+        )
+        self.canvas.create_text(
+            start_x + 50, start_y - 30,
+            text="NEXT",
+            font=("Courier", 14, "bold"),
+            fill=self.TEXT_COLOR,
+            anchor="center"
+        )
+        self.next_items = [
+            self.canvas.create_rectangle(0, 0, 0, 0, outline="#ffffff", width=1)
+            for _ in range(4)
+        ]
+        self.shown_next = None
+        
+        # Stats text, changed only when the numbers change
+        self.stat_items = [
+            self.canvas.create_text(
+                start_x, 250 + i * 30,
+                text="",
+                font=("Courier", 12, "bold"),
+                fill=self.TEXT_COLOR,
+                anchor="nw"
             )
+            for i in range(3)
+        ]
+        self.shown_stats = None
+        self.shown_screen = None
+        
+    def create_cell_items(self):
+        """One image item per well cell, hidden while empty"""
+        self.tiles = TileCache(self.canvas, self.CELL_SIZE)
+        self.cell_items = [
+            [self.canvas.create_image(x * self.CELL_SIZE, y * self.CELL_SIZE, anchor="nw", state="hidden")
+             for x in range(self.GRID_WIDTH)]
+            for y in range(self.GRID_HEIGHT)
+        ]
+    
+    def paint_cell(self, x, y, style):
+        """Show a cell as empty, a solid block or a ghost outline"""
+        if style is None:
+            self.canvas.itemconfigure(self.cell_items[y][x], state="hidden")
         else:
-            # Draw solid piece
-            self.canvas.create_rectangle(
-                pixel_x + 1, pixel_y + 1,
-                pixel_x + self.CELL_SIZE - 1, pixel_y + self.CELL_SIZE - 1,
-                fill=color,
-                outline="#ffffff",
-                width=1
-            )
-            
-            # Add highlight for 3D effect
-            self.canvas.create_line(
-                pixel_x + 1, pixel_y + 1,
-                pixel_x + self.CELL_SIZE - 1, pixel_y + 1,
-                fill="#ffffff",
-                width=2
-            )
-            self.canvas.create_line(
-                pixel_x + 1, pixel_y + 1,
-                pixel_x + 1, pixel_y + self.CELL_SIZE - 1,
-                fill="#ffffff",
-                width=2
-            )
+            self.canvas.itemconfigure(self.cell_items[y][x], image=self.tiles.get(style), state="normal")
+        self.cell_styles[y][x] = style
     
     def draw_grid(self):
         """Draw the game grid"""
@@ -320,97 +640,73 @@ class TetrisGame:
             width=3
         )
     
-    def draw_placed_pieces(self):
-        """Draw all placed pieces on the grid"""
-        for y in range(self.GRID_HEIGHT):
-            for x in range(self.GRID_WIDTH):
-                if self.grid[y][x] is not None:
-                    color = self.COLORS[self.grid[y][x]]
-                    self.draw_cell(x, y, color)
-    
-    def draw_current_piece(self):
-        """Draw the current falling piece"""
-        if not self.current_piece:
-            return
-        
-        # Draw ghost piece first
-        ghost = self.get_ghost_piece()
-        if ghost and ghost['y'] != self.current_piece['y']:
-            ghost_cells = self.get_piece_cells(ghost)
-            ghost_color = self.COLORS[ghost['type']]
-            for x, y in ghost_cells:
+    def draw_cells(self):
+        """Repaint the well cells whose look changed since the last frame"""
+        board = self.board
+        
+        # Falling piece and its ghost, drawn over the locked cells
+        overlay = {}
+        piece = self.current_piece
+        if self.game_started and piece:
+            ghost = self.get_ghost_piece()
+            if ghost and ghost.y != piece.y:
+                style = ('ghost', self.COLORS[ghost.type])
+                for x, y in self.get_piece_cells(ghost):
+                    if 0 <= x < self.GRID_WIDTH and 0 <= y < self.GRID_HEIGHT:
+                        overlay[x, y] = style
+            style = ('solid', self.COLORS[piece.type])
+            for x, y in self.get_piece_cells(piece):
                 if 0 <= x < self.GRID_WIDTH and 0 <= y < self.GRID_HEIGHT:
-                    self.draw_cell(x, y, ghost_color, alpha=0.3)
+                    overlay[x, y] = style
         
-        # Draw current piece
-        cells = self.get_piece_cells(self.current_piece)
-        color = self.COLORS[self.current_piece['type']]
+        # Locked cells only change on lock, line clear and reset
+        if board is self.shown_board and board.version == self.shown_version:
+            cells = self.piece_cells | overlay.keys()
+        else:
+            cells = [(x, y) for y in range(self.GRID_HEIGHT) for x in range(self.GRID_WIDTH)]
+            self.shown_board = board
+            self.shown_version = board.version
         
         for x, y in cells:
-            if 0 <= x < self.GRID_WIDTH and 0 <= y < self.GRID_HEIGHT:
-                self.draw_cell(x, y, color)
+            style = overlay.get((x, y))
+            if style is None:
+                piece_type = board.colors[y][x]
+                if piece_type is not None:
+                    style = ('solid', self.COLORS[piece_type])
+            if style != self.cell_styles[y][x]:
+                self.paint_cell(x, y, style)
+        self.piece_cells = set(overlay)
     
     def draw_next_piece(self):
         """Draw the next piece preview"""
-        if not self.next_piece:
+        if not self.next_piece or self.next_piece is self.shown_next:
             return
+        self.shown_next = self.next_piece
         
-        # Clear next piece area
         start_x = self.CANVAS_WIDTH + 20
         start_y = 100
+        color = self.COLORS[self.next_piece.type]
         
-        self.canvas.create_rectangle(
-            start_x - 10, start_y - 10,
-            start_x + 120, start_y + 120,
-            fill=self.BG_COLOR,
-            outline=self.BORDER_COLOR,
-            width=2
-        )
-        
-        self.canvas.create_text(
-            start_x + 50, start_y - 30,
-            text="NEXT",
-            font=("Courier", 14, "bold"),
-            fill=self.TEXT_COLOR,
-            anchor="center"
-        )
-        
-        # Draw next piece
-        shape = self.SHAPES[self.next_piece['type']][0]
-        color = self.COLORS[self.next_piece['type']]
-        
-        for row_idx, row in enumerate(shape):
-            for col_idx, cell in enumerate(row):
-                if cell != '.':
-                    x = start_x + col_idx * 25
-                    y = start_y + row_idx * 25
-                    
-                    self.canvas.create_rectangle(
-                        x, y, x + 23, y + 23,
-                        fill=color,
-                        outline="#ffffff",
-                        width=1
-                    )
+        for item, (col_idx, row_idx) in zip(self.next_items, self.ROTATIONS[self.next_piece.type][0].cells):
+            x = start_x + col_idx * 25
+            y = start_y + row_idx * 25
+            self.canvas.coords(item, x, y, x + 23, y + 23)
+            self.canvas.itemconfigure(item, fill=color)
     
     def draw_stats(self):
         """Draw game statistics"""
-        start_x = self.CANVAS_WIDTH + 20
-        start_y = 250
-        
-        stats = [
+        stats = (
             f"Score: {self.score}",
             f"Level: {self.level}",
             f"Lines: {self.lines_cleared}",
-        ]
+        )
+        if stats == self.shown_stats:
+            return
         
-        for i, stat in enumerate(stats):
-            self.canvas.create_text(
-                start_x, start_y + i * 30,
-                text=stat,
-                font=("Courier", 12, "bold"),
-                fill=self.TEXT_COLOR,
-                anchor="nw"
-            )
+        for item, stat, shown in zip(self.stat_items, stats, self.shown_stats or ((None,) * 3)):
+            if stat != shown:
+                self.canvas.itemconfigure(item, text=stat)
+        self.shown_stats = stats
     
     def draw_controls(self):
         """Draw control instructions"""
@@ -430,7 +726,8 @@ class TetrisGame:
             "↓ : Soft Drop",
             "↑ : Rotate",
             "Q : Hard Drop",
-            "Space: Rotate"
+            "Space: Rotate",
+            "B : Autopilot"
         ]
         
         for i, control in enumerate(controls):
@@ -450,7 +747,8 @@ class TetrisGame:
                 text="TETRIS",
                 font=("Courier", 32, "bold"),
                 fill="#00f5ff",
-                anchor="center"
+                anchor="center",
+                tags="screen"
             )
             
             self.canvas.create_text(
@@ -458,7 +756,8 @@ class TetrisGame:
                 text="Press any key to start",
                 font=("Courier", 14),
                 fill=self.TEXT_COLOR,
-                anchor="center"
+                anchor="center",
+                tags="screen"
             )
     
     def draw_game_over(self):
@@ -468,7 +767,8 @@ class TetrisGame:
             self.canvas.create_rectangle(
                 0, 0, self.CANVAS_WIDTH, self.CANVAS_HEIGHT,
                 fill="#000000",
-                stipple="gray50"
+                stipple="gray50",
+                tags="screen"
             )
             
             # Game over text
@@ -477,7 +777,8 @@ class TetrisGame:
                 text="GAME OVER",
                 font=("Courier", 24, "bold"),
                 fill="#ef4444",
-                anchor="center"
+                anchor="center",
+                tags="screen"
             )
             
             # Final score
@@ -486,7 +787,8 @@ class TetrisGame:
                 text=f"Final Score: {self.score}",
                 font=("Courier", 16),
                 fill=self.TEXT_COLOR,
-                anchor="center"
+                anchor="center",
+                tags="screen"
             )
             
             # Level reached
@@ -495,7 +797,8 @@ class TetrisGame:
                 text=f"Level Reached: {self.level}",
                 font=("Courier", 12),
                 fill="#94a3b8",
-                anchor="center"
+                anchor="center",
+                tags="screen"
             )
             
             # Restart instruction
@@ -504,50 +807,80 @@ class TetrisGame:
                 text="Press SPACE or ENTER to restart",
                 font=("Courier", 12),
                 fill=self.TEXT_COLOR,
-                anchor="center"
+                anchor="center",
+                tags="screen"
             )
     
-    def draw_everything(self):
-        """Draw all game elements"""
-        # Clear canvas
-        self.canvas.delete("all")
-        
-        # Draw game area
-        self.draw_grid()
-        self.draw_placed_pieces()
-        
-        if self.game_started:
-            self.draw_current_piece()
-        
-        # Draw sidebar
-        self.draw_next_piece()
-        self.draw_stats()
-        self.draw_controls()
-        
-        if not self.game_started:
-            self.draw_instructions()
-        
-        if self.game_over:
-            self.draw_game_over()
+    def invalidate(self, *regions):
+        """Mark parts of the window as changed ('well', 'sidebar', 'screen', default all)
+        and redraw them once the pending events have been handled"""
+        self.dirty.update(regions or ('well', 'sidebar', 'screen'))
+        if not self.redraw_pending:
+            self.redraw_pending = True
+            self.root.after_idle(self.redraw)
+    
+    def redraw(self):
+        """Draw whatever was invalidated since the last redraw"""
+        self.redraw_pending = False
+        regions = self.dirty
+        self.dirty = set()
+        self.draw_everything(regions)
+    
+    def draw_everything(self, regions=('well', 'sidebar', 'screen')):
+        """Bring the canvas up to date, touching only what changed"""
+        if 'well' in regions:
+            self.draw_cells()
+        if 'sidebar' in regions:
+            self.draw_next_piece()
+            self.draw_stats()
+        
+        # Start and game over screens are drawn on top when the screen changes
+        screen = 'over' if self.game_over else 'play' if self.game_started else 'start'
+        if 'screen' in regions and screen != self.shown_screen:
+            self.shown_screen = screen
+            self.canvas.delete("screen")
+            if not self.game_started:
+                self.draw_instructions()
+            if self.game_over:
+                self.draw_game_over()
     
     def update_game(self):
         """Update game state"""
         if not self.game_started or self.game_over:
             return
         
-        current_time = int(time.time() * 1000)
-        
-        if current_time - self.drop_time >= self.drop_interval:
+        if self.autopilot:
+            self.autopilot_move()
+        else:
             self.drop_piece()
-            self.drop_time = current_time
+        self.invalidate('well', 'sidebar')
+        if self.game_over:
+            self.invalidate('screen')
     
     def game_loop(self):
-        """Main game loop"""
+        """Main game loop, one gravity step per tick while a game is in progress"""
         self.update_game()
-        self.draw_everything()
         
-        # Schedule next frame
-        self.root.after(16, self.game_loop)  # ~60 FPS
+        # Schedule next drop; with no game running the loop sleeps until a key starts one
+        if self.game_started and not self.game_over:
+            self.ticker.schedule(self.game_loop, self.drop_interval)
+        else:
+            self.ticker.reset()
+    
+    def benchmark(self, frames=200):
+        """Average milliseconds to repaint a completely full well, Tk's own drawing included"""
+        self.root.update()
+        types = list(self.SHAPES)
+        start = time.perf_counter()
+        for frame in range(frames):
+            # Shift every cell's colour so each frame repaints all of them
+            for y in range(self.GRID_HEIGHT):
+                for x in range(self.GRID_WIDTH):
+                    self.board.colors[y][x] = types[(x + y + frame) % len(types)]
+            self.board.version += 1
+            self.draw_cells()
+            self.root.update()
+        return (time.perf_counter() - start) * 1000 / frames
     
     def run(self):
         """Start the game"""
@@ -560,5 +893,8 @@ class TetrisGame:
         self.root.mainloop()
 
 if __name__ == "__main__":
-    game = TetrisGame()
-    game.run()
\ No newline at end of file
+    game = TetrisGame(mode='bag' if '--bag' in sys.argv else 'uniform')
+    if '--benchmark' in sys.argv:
+        print(f"{game.benchmark():.2f} ms per full-board frame")
+    else:
+        game.run()
\ No newline at end of file
@@ -0,0 +1,379 @@
+"""
+Snake Autopilot
+Steers the snake games in fifth.py and eight.py toward the food.
+
+The autopilot keeps a BFS distance field rooted at the food. The field is
+only rebuilt when the food moves, obstacles change or the field turns out
+to be stale; cells vacated by the tail are relaxed into the existing
+field. A path to the food is taken only if a virtual snake that follows it
+can still reach its own tail afterwards, and is then followed without any
+further search. Otherwise the snake chases its tail until a safe path
+opens up.
+
+The safety check, the tail chase and the open-space fallback flood bit
+masks of the grid, one big-int step per BFS layer instead of one per
+cell, and stop as soon as they have their answer.
+"""
+
+from collections import deque
+import time
+
+UP = (0, -1)
+DOWN = (0, 1)
+LEFT = (-1, 0)
+RIGHT = (1, 0)
+
+
+class Autopilot:
+    """BFS planner over the snake's occupancy grid"""
+
+    def __init__(self, width, height, wrap=False):
+        self.width = width
+        self.height = height
+        self.wrap = wrap
+        self.unreachable = width * height + 1
+
+        # Neighbour table: for every cell, a tuple of (cell, direction)
+        self.neighbors = []
+        for index in range(width * height):
+            x, y = index % width, index // width
+            cells = []
+            for dx, dy in (UP, DOWN, LEFT, RIGHT):
+                nx, ny = x + dx, y + dy
+                if wrap:
+                    nx, ny = nx % width, ny % height
+                elif not (0 <= nx < width and 0 <= ny < height):
+                    continue
+                cells.append((ny * width + nx, (dx, dy)))
+            self.neighbors.append(tuple(cells))
+        self.adjacent = [tuple(cell for cell, _ in cells) for cells in self.neighbors]
+
+        # Bit masks over the same cell numbering, for the flood fills: bit
+        # y * width + x stands for cell (x, y)
+        self.all_bits = (1 << width * height) - 1
+        self.left_bits = sum(1 << y * width for y in range(height))
+        self.right_bits = self.left_bits << width - 1
+        self.top_bits = (1 << width) - 1
+        # A shift by one column must not carry cells over into the next row
+        self.not_left = self.all_bits & ~self.left_bits
+        self.not_right = self.all_bits & ~self.right_bits
+
+        # Any food the snake can get to is reached well within this many
+        # ticks, going without for longer means it is circling in a loop
+        self.patience = 2 * width * height
+
+        self.reset()
+
+    def reset(self):
+        """Forget everything learned about the current game"""
+        self.blocked = [0] * (self.width * self.height)
+        self.body = deque()
+        self.obstacles = ()
+        self.obstacle_cells = frozenset()
+        self.obstacle_bits = 0
+        self.blocked_bits = 0
+        self.dist = [self.unreachable] * (self.width * self.height)
+        self.field_food = None
+        self.plan = deque()
+        self.expected_head = None
+        self.chase_ticks = 0
+        self.hungry = 0
+        self.rebuilds = 0
+
+    def next_direction(self, snake, food, obstacles=()):
+        """Pick the (dx, dy) move for this tick"""
+        self.sync(snake, obstacles)
+        width = self.width
+        head = snake[0][1] * width + snake[0][0]
+        target = food[1] * width + food[0]
+
+        # Keep following a path that was already checked to be safe
+        if self.plan and head == self.expected_head and target == self.field_food:
+            return self.follow_plan()
+
+        if target != self.field_food:
+            self.build_field(target)
+        path = self.path_to_food(head)
+        if path is None:
+            # Stale field, distances through cells the head has since blocked
+            self.build_field(target)
+            path = self.path_to_food(head)
+
+        # After circling for too long, gamble on the food rather than loop forever
+        if path and (self.is_safe(path) or self.chase_ticks > self.patience):
+            self.chase_ticks = 0
+            self.plan = deque(path)
+            return self.follow_plan()
+
+        # No safe route to the food, stay alive until one opens up
+        self.chase_ticks += 1
+        self.plan.clear()
+        self.expected_head = None
+        return self.chase_tail(head)
+
+    @property
+    def looping(self):
+        """Whether the snake has gone so long without eating that it is stuck in a loop"""
+        return self.hungry > self.patience
+
+    def follow_plan(self):
+        """Take the next step of the planned path"""
+        cell, direction = self.plan.popleft()
+        self.expected_head = cell
+        return direction
+
+    def sync(self, snake, obstacles):
+        """Update the blocked cells from the snake's latest position"""
+        width = self.width
+        body = self.body
+        blocked = self.blocked
+
+        # Callers may pass a fresh list every tick, compare by value
+        obstacles = tuple(obstacles)
+        if obstacles != self.obstacles:
+            for x, y in self.obstacles:
+                blocked[y * width + x] -= 1
+            self.obstacles = obstacles
+            for x, y in self.obstacles:
+                blocked[y * width + x] += 1
+            self.obstacle_cells = frozenset(y * width + x for x, y in self.obstacles)
+            self.obstacle_bits = sum(1 << cell for cell in self.obstacle_cells)
+            self.blocked_bits = sum(1 << cell for cell, count in enumerate(blocked) if count)
+            self.field_food = None
+            self.plan.clear()
+
+        head = snake[0][1] * width + snake[0][0]
+        moved = len(snake) > 1 and body and snake[1][1] * width + snake[1][0] == body[0]
+
+        if moved and len(snake) in (len(body), len(body) + 1):
+            # Normal tick: one new head, and the tail moved unless food was eaten
+            body.appendleft(head)
+            blocked[head] += 1
+            self.blocked_bits |= 1 << head
+            if len(body) > len(snake):
+                self.hungry += 1
+                tail = body.pop()
+                blocked[tail] -= 1
+                if not blocked[tail]:
+                    self.blocked_bits ^= 1 << tail
+                    self.relax(tail)
+            else:
+                self.hungry = 0
+            return
+
+        # Anything else (new game, shrink power-up, manual control) rebuilds
+        for cell in body:
+            blocked[cell] -= 1
+        body.clear()
+        for x, y in snake:
+            cell = y * width + x
+            body.append(cell)
+            blocked[cell] += 1
+        self.blocked_bits = sum(1 << cell for cell, count in enumerate(blocked) if count)
+        self.hungry = 0
+        self.field_food = None
+        self.plan.clear()
+
+    def build_field(self, target):
+        """Breadth-first distances from the food to every open cell"""
+        self.rebuilds += 1
+        dist = [self.unreachable] * (self.width * self.height)
+        blocked = self.blocked
+        adjacent = self.adjacent
+        dist[target] = 0
+        queue = [target]
+        for cell in queue:
+            step = dist[cell] + 1
+            for other in adjacent[cell]:
+                if step < dist[other] and not blocked[other]:
+                    dist[other] = step
+                    queue.append(other)
+        self.dist = dist
+        self.field_food = target
+
+    def relax(self, cell):
+        """Let a freshly vacated cell shorten distances through it"""
+        if self.field_food is None:
+            return
+        dist = self.dist
+        blocked = self.blocked
+        adjacent = self.adjacent
+
+        best = self.unreachable
+        for other in adjacent[cell]:
+            if not blocked[other] and dist[other] < best:
+                best = dist[other]
+        if best + 1 >= dist[cell]:
+            return
+        dist[cell] = best + 1
+        queue = [cell]
+        for current in queue:
+            step = dist[current] + 1
+            for other in adjacent[current]:
+                if step < dist[other] and not blocked[other]:
+                    dist[other] = step
+                    queue.append(other)
+
+    def path_to_food(self, head):
+        """Walk down the distance field from the head
+
+        Returns the list of (cell, direction) steps, an empty list when the
+        food is unreachable, or None when the field is stale.
+        """
+        dist = self.dist
+        blocked = self.blocked
+        neighbors = self.neighbors
+
+        best = self.unreachable
+        for cell, _ in neighbors[head]:
+            if not blocked[cell] and dist[cell] < best:
+                best = dist[cell]
+        if best == self.unreachable:
+            return []
+
+        path = []
+        current = head
+        while best >= 0:
+            for cell, direction in neighbors[current]:
+                if dist[cell] == best and not blocked[cell]:
+                    path.append((cell, direction))
+                    current = cell
+                    break
+            else:
+                return None
+            best -= 1
+        return path
+
+    def spread(self, bits):
+        """Cells next to any cell in bits, as a mask"""
+        width = self.width
+        grown = ((bits >> 1 & self.not_right) | (bits << 1 & self.not_left) |
+                 bits >> width | (bits << width & self.all_bits))
+        if self.wrap:
+            grown |= ((bits & self.left_bits) << width - 1 | (bits & self.right_bits) >> width - 1 |
+                      (bits & self.top_bits) << width * (self.height - 1) |
+                      bits >> width * (self.height - 1))
+        return grown
+
+    def is_safe(self, path):
+        """Check that a virtual snake which eats along path can still reach its tail"""
+        length = len(self.body) + 1
+        if length >= self.width * self.height:
+            return True
+
+        # The virtual body after eating: the path reversed, then what is left of the body
+        virtual = [cell for cell, _ in reversed(path)][:length]
+        if len(virtual) < length:
+            virtual.extend(list(self.body)[:length - len(virtual)])
+
+        # Flood out from the head, a whole BFS layer per step, until a cell next to the tail
+        spread = self.spread
+        open_bits = self.all_bits & ~self.obstacle_bits
+        for cell in virtual:
+            open_bits &= ~(1 << cell)
+        goal = spread(1 << virtual[-1])
+        frontier = spread(1 << virtual[0]) & open_bits
+        while frontier:
+            if frontier & goal:
+                return True
+            open_bits &= ~frontier
+            frontier = spread(frontier) & open_bits
+        return False
+
+    def chase_tail(self, head):
+        """Survival move: keep a path to the tail open, taking the long way round"""
+        blocked = self.blocked
+        neighbors = self.neighbors
+        # Moving onto the tail is a collision, it only leaves after the move
+        candidates = [(cell, direction) for cell, direction in neighbors[head] if not blocked[cell]]
+        if not candidates:
+            # Boxed in, every move loses
+            return neighbors[head][0][1]
+
+        # One layered flood outward from the tail measures every candidate at once
+        spread = self.spread
+        open_bits = self.all_bits & ~self.blocked_bits
+        wanted = 0
+        for cell, _ in candidates:
+            wanted |= 1 << cell
+        dist = {}
+        frontier = spread(1 << self.body[-1]) & open_bits
+        step = 1
+        while frontier and wanted:
+            found = frontier & wanted
+            if found:
+                for cell, _ in candidates:
+                    if found >> cell & 1:
+                        dist[cell] = step
+                wanted &= ~found
+            open_bits &= ~frontier
+            frontier = spread(frontier) & open_bits
+            step += 1
+
+        reachable = [(dist[cell], direction) for cell, direction in candidates if cell in dist]
+        if reachable:
+            return max(reachable)[1]
+
+        # The tail is cut off, so take the roomiest pocket
+        return max(candidates, key=lambda candidate: self.open_space(candidate[0]))[1]
+
+    def open_space(self, start):
+        """Number of open cells reachable from start, counted up to the snake's length
+
+        A pocket that can hold the whole snake is as good as any bigger one,
+        so the flood stops there instead of filling the rest of the board.
+        """
+        spread = self.spread
+        limit = len(self.body)
+        open_bits = self.all_bits & ~self.blocked_bits & ~(1 << start)
+        frontier = 1 << start
+        size = 1
+        while frontier and size < limit:
+            frontier = spread(frontier) & open_bits
+            open_bits &= ~frontier
+            size += bin(frontier).count('1')
+        return min(size, limit)
+
+
+def benchmark(games=20, width=40, height=30, max_ticks=50000):
+    """Play headless games and report the mean and worst planning time per tick
+
+    Each game is played twice and every tick timed in both runs. The moves
+    are the same both times, so the faster of the two is the planner's own
+    cost; the slower one also holds any pause the process took meanwhile.
+    A game stops once the autopilot is looping with no way to the food.
+    """
+    from snake_headless import HeadlessSnake
+
+    autopilot = Autopilot(width, height)
+    best = []
+    raw_worst = 0.0
+
+    for seed in range(games):
+        runs = []
+        for _ in range(2):
+            autopilot.reset()
+            game = HeadlessSnake(width, height, seed)
+            times = []
+            while game.ticks < max_ticks and not autopilot.looping:
+                start = time.perf_counter()
+                direction = autopilot.next_direction(game.snake, game.food)
+                times.append(time.perf_counter() - start)
+                if not game.step(direction):
+                    break
+            runs.append(times)
+        times = [min(pair) for pair in zip(*runs)]
+        best.extend(times)
+        raw_worst = max(raw_worst, max(runs[0]), max(runs[1]))
+        ending = "looping" if autopilot.looping else "over" if game.game_over else "tick limit"
+        print(f"Game {seed + 1:3d}: score {game.score:5d}  length {len(game.snake):4d}  "
+              f"ticks {game.ticks:6d} ({ending:10s})  worst tick {max(times) * 1000:6.3f} ms")
+
+    best.sort()
+    print(f"\nMean planning time: {sum(best) / len(best) * 1000:.3f} ms/tick")
+    print(f"99.9th percentile: {best[int(len(best) * 0.999)] * 1000:.3f} ms")
+    print(f"Worst tick:        {best[-1] * 1000:.3f} ms ({raw_worst * 1000:.3f} ms in a single run)")
+
+
+if __name__ == "__main__":
+    benchmark()
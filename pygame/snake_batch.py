@@ -0,0 +1,217 @@
+"""
+Batch Snake Simulator
+Steps thousands of independent snake games at once with NumPy, using the
+rules of SnakeGame.update_game in fifth.py.
+
+Every game keeps its body in a column of a ring buffer, its cells in a row
+of an occupancy array and its food in one row of an (N, 2) array, so a tick
+is a handful of array operations no matter how many games are running.
+Finished games are reset automatically.
+
+The occupancy array holds the tick at which the head last entered each
+cell. A cell is part of the snake while that tick is within the last
+`length` ticks, so the tail frees itself and growing is just a longer
+length: a tick never has to look up or clear the tail. The grid carries a
+one-cell border that is always occupied, so running into a wall and
+running into the body are the same lookup. All games share one tick
+counter, which makes writing the new heads into the ring one row copy.
+"""
+
+import time
+
+import numpy as np
+
+from snake_headless import HeadlessSnake
+
+# Actions are indices into this table
+DIRECTIONS = np.array([(0, -1), (0, 1), (-1, 0), (1, 0)])  # up, down, left, right
+
+# TURN[current * 4 + wanted] is the action taken, reversing into the neck is ignored
+TURN = np.array([current if wanted == opposite else wanted
+                 for current, opposite in enumerate((1, 0, 3, 2))
+                 for wanted in range(4)])
+
+# Entry ticks of cells that are always or never occupied
+WALL = np.iinfo(np.int32).max // 2
+FREE = np.iinfo(np.int32).min // 2
+
+
+class BatchSnake:
+    """N snake games on a walled grid, advanced together one tick at a time"""
+
+    def __init__(self, games, width=40, height=30, seed=None):
+        self.games = games
+        self.width = width
+        self.height = height
+        self.cells = width * height
+        self.rng = np.random.default_rng(seed)
+        self.rows = np.arange(games)
+
+        # Cells are numbered on the grid with its border, (y + 1) * stride + x + 1
+        self.stride = width + 2
+        padded = self.stride * (height + 2)
+        self.moves = DIRECTIONS[:, 1] * self.stride + DIRECTIONS[:, 0]
+        self.empty_row = np.full((height + 2, self.stride), WALL, dtype=np.int32)
+        self.empty_row[1:-1, 1:-1] = FREE
+        self.empty_row = self.empty_row.reshape(-1)
+
+        # A power-of-two ring wraps with a mask instead of a modulo
+        capacity = 1 << (self.cells - 1).bit_length()
+        self.ring_mask = capacity - 1
+
+        # Offset of each game's row in the flattened occupancy array. Heads,
+        # body segments and food are kept as slots of the flattened array.
+        self.occupied_base = self.rows * padded
+
+        # body[(tick - k) & ring_mask, game] is the k-th segment from the head
+        self.tick = 0
+        self.body = np.zeros((capacity, games), dtype=np.int32)
+        self.entered = np.zeros((games, padded), dtype=np.int32)
+        self.head_slot = np.zeros(games, dtype=np.intp)
+        self.length = np.zeros(games, dtype=np.intp)
+        self.food = np.zeros((games, 2), dtype=np.intp)
+        self.food_slot = np.zeros(games, dtype=np.intp)
+        self.action = np.zeros(games, dtype=np.intp)
+        self.score = np.zeros(games, dtype=np.intp)
+        self.started = np.zeros(games, dtype=np.intp)
+
+        # Flat view of the occupancy array
+        self.entered_flat = self.entered.reshape(-1)
+
+        # Scores of every game that has ended, in the order they ended
+        self.finished_scores = []
+
+        self.reset(self.rows)
+
+    def cell(self, x, y):
+        """Cell number of a grid position"""
+        return (y + 1) * self.stride + x + 1
+
+    def reset(self, games):
+        """Put the given games back to the starting position"""
+        self.restart_snakes(games)
+        self.place_food(games)
+
+    def restart_snakes(self, games):
+        """Put the snakes of the given games back to the starting position, without food"""
+        start = self.cell(self.width // 2, self.height // 2)
+        slots = self.occupied_base[games] + start
+
+        # The body was entered tail first, ending with the head on this tick
+        tick = self.tick
+        self.entered[games] = self.empty_row
+        self.entered[games, start - 2:start + 1] = (tick - 2, tick - 1, tick)
+        for k in range(3):
+            self.body[(tick - k) & self.ring_mask, games] = slots - k
+        self.head_slot[games] = slots
+        self.length[games] = 3
+        self.action[games] = 3
+        self.score[games] = 0
+        self.started[games] = tick
+
+    @property
+    def ticks(self):
+        """(N,) ticks played in each game since it started"""
+        return self.tick - self.started
+
+    @property
+    def occupied(self):
+        """(N, cells) mask of the cells covered by each snake, border excluded"""
+        covered = self.entered > (self.tick - self.length)[:, None]
+        covered = covered.reshape(self.games, self.height + 2, self.stride)[:, 1:-1, 1:-1]
+        return covered.reshape(self.games, -1)
+
+    def place_food(self, games):
+        """Drop food on a random free cell in each of the given games"""
+        pending = np.asarray(games)
+        while len(pending):
+            y, x = np.divmod(self.rng.integers(0, self.cells, size=len(pending)), self.width)
+            slots = self.occupied_base[pending] + self.cell(x, y)
+            self.food[pending, 0] = x
+            self.food[pending, 1] = y
+            self.food_slot[pending] = slots
+            # Redraw only the games whose food landed on the snake
+            covered = self.entered_flat[slots] > self.tick - self.length[pending]
+            pending = pending[covered]
+
+    def heads(self):
+        """(N, 2) array of head positions"""
+        head = self.head_slot - self.occupied_base
+        return np.stack((head % self.stride - 1, head // self.stride - 1), axis=1)
+
+    def snake(self, game):
+        """Body of one game as a list of (x, y), head first"""
+        indices = (self.tick - np.arange(self.length[game])) & self.ring_mask
+        cells = self.body[indices, game] - self.occupied_base[game]
+        return [(cell % self.stride - 1, cell // self.stride - 1) for cell in cells.tolist()]
+
+    def step(self, actions):
+        """Advance every game one tick
+
+        actions is an (N,) array of indices into DIRECTIONS. Returns the
+        reward of each game and a mask of the games that ended this tick,
+        which have already been reset.
+        """
+        self.action = TURN[self.action * 4 + actions]
+        new_head = self.head_slot + self.moves[self.action]
+        self.tick += 1
+        tick = self.tick
+
+        # Walls and the whole body, tail included, count as occupied; food never is
+        dead = self.entered_flat[new_head] >= tick - self.length
+        ate = new_head == self.food_slot
+
+        # Every game moves, dead ones are reset below so whatever they write is dropped
+        self.entered_flat[new_head] = tick
+        self.body[tick & self.ring_mask] = new_head
+        self.head_slot = new_head
+
+        # Grow when food was eaten, the tail stays put for one tick
+        self.length += ate
+        rewards = ate * 10
+        self.score += rewards
+        rewards -= dead * 10
+
+        # Board is full, nothing left to eat
+        done = dead | (ate & (self.length == self.cells))
+
+        finished = np.flatnonzero(done)
+        if len(finished):
+            self.finished_scores.extend(self.score[finished].tolist())
+            self.restart_snakes(finished)
+        hungry = np.flatnonzero(ate | done)
+        if len(hungry):
+            self.place_food(hungry)
+        return rewards, done
+
+
+def benchmark(games=4096, ticks=500, width=40, height=30):
+    """Compare batch throughput with looping the scalar engine, under random play"""
+    rng = np.random.default_rng(0)
+
+    batch = BatchSnake(games, width, height, seed=0)
+    actions = rng.integers(0, 4, size=(ticks, games))
+    start = time.perf_counter()
+    for tick_actions in actions:
+        batch.step(tick_actions)
+    batch_rate = games * ticks / (time.perf_counter() - start)
+
+    scalar = [HeadlessSnake(width, height, seed) for seed in range(games // 8)]
+    scalar_ticks = len(scalar) * ticks // 8
+    directions = [tuple(direction) for direction in DIRECTIONS.tolist()]
+    actions = rng.integers(0, 4, size=scalar_ticks).tolist()
+    start = time.perf_counter()
+    for step, action in enumerate(actions):
+        game = scalar[step % len(scalar)]
+        if not game.step(directions[action]):
+            game.reset()
+    scalar_rate = scalar_ticks / (time.perf_counter() - start)
+
+    print(f"Batch of {games}: {batch_rate:,.0f} game ticks/s "
+          f"({len(batch.finished_scores)} games finished)")
+    print(f"Scalar loop:     {scalar_rate:,.0f} game ticks/s")
+    print(f"Speed-up:        {batch_rate / scalar_rate:.1f}x")
+
+
+if __name__ == "__main__":
+    benchmark()
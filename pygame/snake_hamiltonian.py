@@ -0,0 +1,181 @@
+"""
+Hamiltonian Snake Solver
+A snake that never dies, for soak tests that fill the whole board in
+third.py and fifth.py.
+
+The snake follows a Hamiltonian cycle that visits every cell once. While
+the board is still mostly empty it takes shortcuts toward the food, but
+never far enough to pass its own tail in cycle order, so the body always
+stays laid out along the cycle behind the head.
+
+Cycles are cached on disk per grid size so startup is instant.
+"""
+
+import json
+import os
+import time
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "hamiltonian_cache")
+
+UP = (0, -1)
+DOWN = (0, 1)
+LEFT = (-1, 0)
+RIGHT = (1, 0)
+
+
+def build_cycle(width, height):
+    """Cells of a Hamiltonian cycle as y * width + x indices
+
+    Rows are swept back and forth over columns 1..width-1 and column 0
+    is the way back up, which closes the loop when height is even.
+    """
+    if height % 2:
+        if width % 2:
+            raise ValueError(f"No Hamiltonian cycle exists on a {width}x{height} grid")
+        # Sweep columns instead of rows
+        return [(index % height) * width + index // height
+                for index in build_cycle(height, width)]
+
+    cycle = [0]
+    for y in range(height):
+        columns = range(1, width) if y % 2 == 0 else range(width - 1, 0, -1)
+        cycle.extend(y * width + x for x in columns)
+    cycle.extend(y * width for y in range(height - 1, 0, -1))
+    return cycle
+
+
+def load_cycle(width, height):
+    """Read the cycle for a grid size from the cache, building it on first use"""
+    path = os.path.join(CACHE_DIR, f"cycle_{width}x{height}.json")
+    try:
+        with open(path, 'r') as f:
+            cycle = json.load(f)
+        if len(cycle) == width * height:
+            return cycle
+    except (OSError, ValueError):
+        pass
+
+    cycle = build_cycle(width, height)
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(cycle, f)
+    except OSError:
+        pass
+    return cycle
+
+
+class HamiltonianSolver:
+    """Follows a Hamiltonian cycle, cutting corners toward the food while it is safe"""
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.size = width * height
+        self.cycle = load_cycle(width, height)
+
+        # Neighbour table: for every cell, a tuple of ((x, y), direction)
+        self.neighbors = []
+        for index in range(self.size):
+            x, y = index % width, index // width
+            cells = []
+            for dx, dy in (UP, DOWN, LEFT, RIGHT):
+                nx, ny = x + dx, y + dy
+                if 0 <= nx < width and 0 <= ny < height:
+                    cells.append(((nx, ny), (dx, dy)))
+            self.neighbors.append(tuple(cells))
+
+        # Position of every cell along the cycle, in both directions of travel
+        self.forward = [0] * self.size
+        for position, cell in enumerate(self.cycle):
+            self.forward[cell] = position
+        self.backward = [(self.size - position) % self.size for position in self.forward]
+
+        self.reset()
+
+    def reset(self):
+        """Start a new game, the cycle direction is picked from the first snake seen"""
+        self.order = None
+        self.settling = 0
+
+    def orient(self, snake):
+        """Run the cycle in whichever direction the snake's body already lies along"""
+        width = self.width
+        for order in (self.forward, self.backward):
+            positions = [order[y * width + x] for x, y in snake]
+            if all((ahead - behind) % self.size == 1
+                   for ahead, behind in zip(positions, positions[1:])):
+                return order
+
+        # The body is off the cycle: follow it without shortcuts until the
+        # whole body has been pulled onto it
+        self.settling = len(snake)
+        head_x, head_y = snake[0]
+        head = self.forward[head_y * width + head_x]
+        for order, step in ((self.forward, 1), (self.backward, -1)):
+            successor = self.cycle[(head + step) % self.size]
+            if (successor % width, successor // width) not in snake:
+                return order
+        return self.forward
+
+    def next_direction(self, snake, food, occupied=None):
+        """Pick the (dx, dy) move for this tick"""
+        if self.order is None:
+            self.order = self.orient(snake)
+        if occupied is None:
+            occupied = set(snake)
+
+        size = self.size
+        order = self.order
+        width = self.width
+        head_x, head_y = snake[0]
+        tail_x, tail_y = snake[-1]
+        head = order[head_y * width + head_x]
+
+        distance_to_tail = (order[tail_y * width + tail_x] - head) % size
+        distance_to_food = (order[food[1] * width + food[0]] - head) % size if food else 1
+
+        # How far ahead along the cycle the head may jump without passing the tail
+        empty = size - len(snake) - 1
+        cutting = distance_to_tail - 4
+        if empty < size // 2 or self.settling:
+            self.settling = max(0, self.settling - 1)
+            cutting = 0
+        elif distance_to_food < distance_to_tail:
+            # Eating grows the snake, leave room for it
+            cutting -= 1
+            if (distance_to_tail - distance_to_food) * 4 < empty:
+                cutting -= 10
+        cutting = min(cutting, distance_to_food)
+
+        best = RIGHT
+        best_distance = 0
+        for cell, direction in self.neighbors[head_y * width + head_x]:
+            if cell in occupied:
+                continue
+            # The next cell on the cycle is always allowed, shortcuts only within the budget
+            distance = (order[cell[1] * width + cell[0]] - head) % size
+            if (distance == 1 or distance <= cutting) and distance > best_distance:
+                best, best_distance = direction, distance
+        return best
+
+
+def soak(width=40, height=30, games=3):
+    """Play headless games until the board is full and report throughput"""
+    from snake_headless import play
+
+    for seed in range(games):
+        solver = HamiltonianSolver(width, height)
+        game = play(lambda game: solver.next_direction(game.snake, game.food, game.occupied),
+                    width, height, seed=seed, max_ticks=10 ** 9)
+        filled = len(game.snake) == width * height
+        print(f"Game {seed + 1}: length {len(game.snake)}/{width * height}  "
+              f"ticks {game.ticks}  {'board filled' if filled else 'DIED'}  "
+              f"{game.ticks / game.elapsed:,.0f} ticks/s")
+
+
+if __name__ == "__main__":
+    start = time.perf_counter()
+    load_cycle(40, 30)
+    print(f"Cycle ready in {(time.perf_counter() - start) * 1000:.2f} ms")
+    soak()
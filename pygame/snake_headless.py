@@ -0,0 +1,84 @@
+"""
+Headless Snake Engine
+The rules of SnakeGame.update_game in fifth.py without tkinter, so bots,
+soak tests and benchmarks can play at full speed.
+"""
+
+import random
+import time
+
+
+class HeadlessSnake:
+    """Snake on a walled grid: eat food to grow, hitting a wall or yourself ends the game"""
+
+    def __init__(self, width=40, height=30, seed=None):
+        self.width = width
+        self.height = height
+        self.rng = random.Random(seed)
+        self.reset()
+
+    def reset(self):
+        """Reset game to initial state"""
+        start_x = self.width // 2
+        start_y = self.height // 2
+
+        self.snake = [(start_x, start_y), (start_x - 1, start_y), (start_x - 2, start_y)]
+        self.occupied = set(self.snake)
+        self.direction = (1, 0)
+        self.score = 0
+        self.ticks = 0
+        self.game_over = False
+        self.food = self.generate_food()
+
+    def generate_food(self):
+        """Generate food at random position not occupied by snake"""
+        if len(self.snake) >= self.width * self.height:
+            return None
+        while True:
+            food = (self.rng.randrange(self.width), self.rng.randrange(self.height))
+            if food not in self.occupied:
+                return food
+
+    def step(self, direction=None):
+        """Advance one tick, returns False once the game is over"""
+        if self.game_over:
+            return False
+
+        # Reversing into the neck is ignored, like the key handler does
+        if direction is not None and (direction[0] + self.direction[0] or
+                                      direction[1] + self.direction[1]):
+            self.direction = direction
+
+        self.ticks += 1
+        head_x, head_y = self.snake[0]
+        new_head = (head_x + self.direction[0], head_y + self.direction[1])
+
+        # Check wall and self collisions
+        if (not 0 <= new_head[0] < self.width or not 0 <= new_head[1] < self.height or
+                new_head in self.occupied):
+            self.game_over = True
+            return False
+
+        self.snake.insert(0, new_head)
+        self.occupied.add(new_head)
+
+        if new_head == self.food:
+            self.score += 10
+            self.food = self.generate_food()
+            if self.food is None:
+                # Board is full, nothing left to eat
+                self.game_over = True
+                return False
+        else:
+            self.occupied.discard(self.snake.pop())
+        return True
+
+
+def play(policy, width=40, height=30, seed=None, max_ticks=100000):
+    """Let a policy play one game, policy(game) returns a (dx, dy) direction"""
+    game = HeadlessSnake(width, height, seed)
+    start = time.perf_counter()
+    while game.ticks < max_ticks and game.step(policy(game)):
+        pass
+    game.elapsed = time.perf_counter() - start
+    return game
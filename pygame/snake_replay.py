@@ -0,0 +1,383 @@
+"""
+Snake Replays
+Compact recordings of games from eight.py for archiving, sharing and
+regression checks.
+
+A replay stores the game's RNG seed and the direction of every tick as
+run-length encoded (direction, ticks) pairs, packed as varints. Long
+stretches without a turn cost a byte or two. State digests taken every
+CHECKPOINT_INTERVAL ticks, plus one at the end, let the validator point at
+where a re-simulation first diverged from the recording.
+
+Version 2 replays also store the grid size, the starting head and every
+food spawn, so trace() can check the moves against the food without the
+rules engine. A run of moves is a straight line, so the tick the head
+reaches the food is solved for directly instead of stepping each tick.
+
+Usage: python snake_replay.py [--fast] [--record N] [replay files...]
+"""
+
+import sys
+import time
+import zlib
+from dataclasses import dataclass, field
+from typing import List, Tuple
+
+MAGIC = b'SNKR'
+VERSION = 2
+CHECKPOINT_INTERVAL = 1024
+VARIANTS = ('classic', 'advanced')
+
+# Direction codes, in the order of the Direction enum in eight.py
+DIRECTIONS = ((0, -1), (0, 1), (-1, 0), (1, 0))
+CODES = {direction: code for code, direction in enumerate(DIRECTIONS)}
+
+
+def write_varint(out, value):
+    """Append an unsigned int to a bytearray, 7 bits per byte"""
+    while value >= 0x80:
+        out.append((value & 0x7f) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def read_varint(data, pos):
+    """Read an unsigned int written by write_varint, returns (value, new position)"""
+    value = 0
+    shift = 0
+    while True:
+        if pos >= len(data):
+            raise ValueError("Replay is truncated")
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+def state_digest(game):
+    """CRC of everything the rules depend on, to spot a diverging re-simulation"""
+    state = (game.score, game.level, game.invincible_time, game.direction.value,
+             tuple(game.snake), game.food, game.special_food, sorted(game.power_ups),
+             tuple(getattr(game, 'obstacles', ())), getattr(game, 'combo_count', 0))
+    return zlib.crc32(repr(state).encode())
+
+
+@dataclass
+class Replay:
+    variant: str
+    seed: int
+    runs: List[Tuple[int, int]] = field(default_factory=list)  # (direction code, ticks)
+    ticks: int = 0
+    score: int = 0
+    digest: int = 0
+    checkpoint_interval: int = CHECKPOINT_INTERVAL
+    checkpoints: List[int] = field(default_factory=list)
+    width: int = 0
+    height: int = 0
+    start: Tuple[int, int] = (0, 0)
+    foods: List[Tuple[int, int, int]] = field(default_factory=list)  # (tick placed, x, y)
+
+    def encode(self):
+        """Pack the replay into bytes"""
+        out = bytearray(MAGIC)
+        out.append(VERSION)
+        for value in (VARIANTS.index(self.variant), self.seed, self.ticks, self.score,
+                      self.digest, self.checkpoint_interval, len(self.checkpoints)):
+            write_varint(out, value)
+        for checkpoint in self.checkpoints:
+            write_varint(out, checkpoint)
+        write_varint(out, len(self.runs))
+        for code, ticks in self.runs:
+            write_varint(out, ticks << 2 | code)
+        for value in (self.width, self.height, *self.start, len(self.foods)):
+            write_varint(out, value)
+        last = 0
+        for tick, x, y in self.foods:
+            write_varint(out, tick - last)
+            write_varint(out, x)
+            write_varint(out, y)
+            last = tick
+        return bytes(out)
+
+    @classmethod
+    def decode(cls, data):
+        """Unpack bytes written by encode"""
+        if data[:4] != MAGIC:
+            raise ValueError("Not a snake replay")
+        if len(data) < 5:
+            raise ValueError("Replay is truncated")
+        if data[4] not in (1, VERSION):
+            raise ValueError(f"Unsupported replay version {data[4]}")
+        pos = 5
+        header = []
+        for _ in range(7):
+            value, pos = read_varint(data, pos)
+            header.append(value)
+        variant, seed, ticks, score, digest, interval, count = header
+        if variant >= len(VARIANTS):
+            raise ValueError(f"Unknown snake variant {variant}")
+
+        checkpoints = []
+        for _ in range(count):
+            value, pos = read_varint(data, pos)
+            checkpoints.append(value)
+
+        count, pos = read_varint(data, pos)
+        runs = []
+        for _ in range(count):
+            value, pos = read_varint(data, pos)
+            runs.append((value & 3, value >> 2))
+        replay = cls(VARIANTS[variant], seed, runs, ticks, score, digest, interval, checkpoints)
+        if data[4] == 1:
+            return replay
+
+        # Version 2: grid, starting head and food spawns
+        extra = []
+        for _ in range(5):
+            value, pos = read_varint(data, pos)
+            extra.append(value)
+        replay.width, replay.height, x, y, count = extra
+        replay.start = (x, y)
+        tick = 0
+        for _ in range(count):
+            delta, pos = read_varint(data, pos)
+            x, pos = read_varint(data, pos)
+            y, pos = read_varint(data, pos)
+            tick += delta
+            replay.foods.append((tick, x, y))
+        return replay
+
+    def save(self, path):
+        """Write the replay to a file"""
+        with open(path, 'wb') as f:
+            f.write(self.encode())
+
+    @classmethod
+    def load(cls, path):
+        """Read a replay from a file"""
+        with open(path, 'rb') as f:
+            return cls.decode(f.read())
+
+
+class ReplayRecorder:
+    """Builds a replay while a game is played, one record() call per tick"""
+
+    def __init__(self, variant, seed, checkpoint_interval=CHECKPOINT_INTERVAL):
+        self.variant = variant
+        self.seed = seed
+        self.checkpoint_interval = checkpoint_interval
+        self.runs = []
+        self.code = None
+        self.count = 0
+        self.checkpoints = []
+        self.ticks = 0
+        self.score = 0
+        self.digest = 0
+        self.width = 0
+        self.height = 0
+        self.start = (0, 0)
+        self.food = None
+        self.foods = []
+
+    def note_food(self, game, tick):
+        """Log the food if it moved, as placed by the move on tick"""
+        if game.food != self.food:
+            self.food = game.food
+            self.foods.append((tick, game.food.x, game.food.y))
+
+    def record(self, game):
+        """Log the direction of the move about to be made on game.ticks"""
+        if game.ticks == 1:
+            self.width, self.height = game.GRID_WIDTH, game.GRID_HEIGHT
+            self.start = tuple(game.snake[0])
+        # Food seen before this tick's move was placed by the previous one
+        self.note_food(game, game.ticks - 1)
+        code = CODES[game.direction.value]
+        if code == self.code:
+            self.count += 1
+        else:
+            if self.count:
+                self.runs.append((self.code, self.count))
+            self.code = code
+            self.count = 1
+        if game.ticks % self.checkpoint_interval == 0:
+            self.checkpoints.append(state_digest(game))
+
+    def finish(self, game):
+        """Note the final state once the game has ended"""
+        self.note_food(game, game.ticks)
+        self.ticks = game.ticks
+        self.score = game.score
+        self.digest = state_digest(game)
+
+    def replay(self):
+        """The recording so far as a Replay"""
+        runs = self.runs + [(self.code, self.count)] if self.count else list(self.runs)
+        return Replay(self.variant, self.seed, runs, self.ticks, self.score, self.digest,
+                      self.checkpoint_interval, list(self.checkpoints),
+                      self.width, self.height, self.start, list(self.foods))
+
+
+def engine_for(variant):
+    """Headless rules engine for a replay variant"""
+    from eight import SnakeEngine, AdvancedSnakeEngine
+
+    return {'classic': SnakeEngine, 'advanced': AdvancedSnakeEngine}[variant]()
+
+
+def play(replay, check=True):
+    """Re-simulate a replay headlessly
+
+    Returns the engine in its final state and a list of problems, which is
+    empty when the game matched the recording.
+    """
+    from eight import Direction, GameState
+
+    game = engine_for(replay.variant)
+    game.new_game(replay.seed)
+    game.recorder = None
+    directions = list(Direction)
+    playing = GameState.PLAYING
+    interval = replay.checkpoint_interval if check else 0
+    checkpoints = iter(replay.checkpoints)
+    next_check = interval
+    problems = []
+
+    for code, ticks in replay.runs:
+        direction = directions[code]
+        for _ in range(ticks):
+            if game.state != playing:
+                problems.append(f"game ended on tick {game.ticks}, the recording goes on")
+                return game, problems
+            game.direction = direction
+            if game.ticks + 1 == next_check:
+                # Checkpoints are taken at the start of a tick, before the move
+                expected = next(checkpoints, None)
+                if expected is not None and state_digest(game) != expected and not problems:
+                    problems.append(f"state diverges between ticks {next_check - interval} and {next_check}")
+                next_check += interval
+            game.move_snake()
+
+    if check:
+        if game.ticks != replay.ticks:
+            problems.append(f"played {game.ticks} ticks, recorded {replay.ticks}")
+        if game.score != replay.score:
+            problems.append(f"final score {game.score}, recorded {replay.score}")
+        if state_digest(game) != replay.digest:
+            problems.append("final state differs from the recording")
+    return game, problems
+
+
+def trace(replay):
+    """Follow the recorded moves and food spawns without the rules engine
+
+    Only the head and the food are tracked. Returns the cell the last move
+    headed for (the crash site when the game was lost), how many foods were
+    eaten and a list of problems, empty when every recorded food was reached
+    on the tick its successor was placed.
+    """
+    if not replay.foods:
+        raise ValueError("Replay has no food record, it predates version 2")
+    width, height = replay.width, replay.height
+    x, y = replay.start
+    foods = replay.foods
+    _, fx, fy = foods[0]
+    eaten = 0
+    tick = 0
+    problems = []
+
+    for code, ticks in replay.runs:
+        dx, dy = DIRECTIONS[code]
+        end = tick + ticks
+        while True:
+            # Moves until the head lands on the food, if it lies ahead on this line
+            if dx and y == fy:
+                steps = (fx - x) * dx % width or width
+            elif dy and x == fx:
+                steps = (fy - y) * dy % height or height
+            else:
+                break
+            if tick + steps > end:
+                break
+            tick += steps
+            x, y = fx, fy
+            eaten += 1
+            if eaten == len(foods) or foods[eaten][0] != tick:
+                problems.append(f"head reaches the food on tick {tick}, but no new food was placed then")
+                return (x, y), eaten, problems
+            _, fx, fy = foods[eaten]
+        x = (x + dx * (end - tick)) % width
+        y = (y + dy * (end - tick)) % height
+        tick = end
+
+    if eaten + 1 < len(foods):
+        problems.append(f"food placed on tick {foods[eaten + 1][0]} without reaching the one before")
+    if tick != replay.ticks:
+        problems.append(f"moves cover {tick} ticks, recorded {replay.ticks}")
+    return (x, y), eaten, problems
+
+
+def validate(paths, fast=False):
+    """Re-simulate archived replays and report any that diverge
+
+    With fast, only trace() the moves against the recorded food instead.
+    """
+    failures = 0
+    for path in paths:
+        try:
+            replay = Replay.load(path)
+        except (OSError, ValueError) as e:
+            print(f"{path}: unreadable ({e})")
+            failures += 1
+            continue
+
+        start = time.perf_counter()
+        try:
+            if fast:
+                _, _, problems = trace(replay)
+            else:
+                _, problems = play(replay)
+        except ValueError as e:
+            print(f"{path}: unreadable ({e})")
+            failures += 1
+            continue
+        elapsed = time.perf_counter() - start
+        rate = replay.ticks / elapsed if elapsed else 0
+        if problems:
+            failures += 1
+            print(f"{path}: DIVERGED - {'; '.join(problems)}")
+        else:
+            print(f"{path}: ok, {replay.ticks} ticks, score {replay.score}, {rate:,.0f} ticks/s")
+    return failures
+
+
+def record_autopilot_game(variant='advanced', seed=None, max_ticks=200000):
+    """Let the autopilot play a headless game and return its replay"""
+    game = engine_for(variant)
+    game.new_game(seed)
+    game.toggle_autopilot()
+    playing = game.state
+    while game.state == playing and game.ticks < max_ticks:
+        game.move_snake()
+    if game.state == playing:
+        game.recorder.finish(game)
+    return game.recorder.replay()
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    fast = '--fast' in args
+    if fast:
+        args.remove('--fast')
+    if args[:1] == ['--record']:
+        # Archive a few autopilot games to check later
+        for seed in range(int(args[1])):
+            replay = record_autopilot_game(seed=seed)
+            path = f"autopilot-{seed}.snkr"
+            replay.save(path)
+            print(f"{path}: {replay.ticks} ticks, {len(replay.runs)} runs, {len(replay.encode())} bytes")
+            args.append(path)
+        args = args[2:]
+    sys.exit(1 if validate(args, fast) else 0)
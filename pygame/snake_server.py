@@ -0,0 +1,520 @@
+"""
+Snake Server
+Hosts snake tournaments for bots over asyncio, using the rules engine of
+eight.py.
+
+Every arena gives each of its players their own game from the arena's
+seed, so all bots face the same food and power-ups, and advances all of
+them in lockstep. One process hosts any number of arenas. Bots and
+spectators connect over local TCP or a Unix socket.
+
+Frames in both directions are a varint length followed by a payload.
+
+Client to server:
+    b'J' + arena name     join an arena as a player (first frame only)
+    b'S' + arena name     watch an arena (first frame only)
+    one byte 0-3          turn, codes as in snake_replay.DIRECTIONS
+    b'R'                  start a new game from the arena seed
+
+Server to client:
+    b'H' player id, grid width, grid height, seed    after joining (id 0 for spectators)
+    b'T' tick, then for each game that changed:
+         player id, flags, and the fields the flags name
+
+Tick frames are deltas: a moving snake costs its new head cell and the
+number of tail cells dropped. A client that has just joined first gets a
+tick frame with the full state of every game. Each tick's frame is
+encoded once per arena and handed to every client in a single write.
+
+Usage: python snake_server.py [--port N | --unix PATH] [--variant V]
+                              [--interval MS] [--bots N] [--seconds S]
+"""
+
+import argparse
+import asyncio
+from collections import deque
+import time
+
+from eight import Direction, GameState
+from snake_autopilot import Autopilot
+from snake_replay import DIRECTIONS, engine_for, read_varint, write_varint
+
+# Fields present in a game's delta
+SNAKE = 1          # new head cell, then number of tail cells dropped
+SNAKE_FULL = 2     # length, then every cell from the head
+FOOD = 4           # food cell
+SPECIAL_FOOD = 8   # special food cell + 1, or 0 for none
+POWER_UPS = 16     # count, then cells
+OBSTACLES = 32     # count, then cells
+SCORE = 64         # score, then level
+OVER = 128         # the game has ended
+LEFT = 256         # the player disconnected
+
+RESTART = ord('R')
+MAX_FRAME = 256              # largest frame a client may send
+MAX_BUFFERED = 1 << 20       # drop clients this far behind on reading
+MAX_CATCH_UP = 3             # late ticks run back to back before resyncing
+
+
+async def read_frame(reader, limit=None):
+    """Read one length-prefixed frame from a stream"""
+    length = 0
+    shift = 0
+    while True:
+        byte = (await reader.readexactly(1))[0]
+        length |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            break
+        shift += 7
+    if limit is not None and length > limit:
+        raise ValueError("Frame too large")
+    return await reader.readexactly(length)
+
+
+def frame(payload):
+    """Prefix a payload with its length"""
+    out = bytearray()
+    write_varint(out, len(payload))
+    out += payload
+    return bytes(out)
+
+
+class Player:
+    """A connected bot, its game, and what the clients last saw of it"""
+
+    def __init__(self, player_id, client, engine):
+        self.id = player_id
+        self.client = client
+        self.engine = engine
+        self.turn = None
+        self.restart = False
+        self.left = False
+        self.announced = False
+
+        # State as of the last broadcast, to encode the next delta against
+        self.head = None
+        self.length = 0
+        self.food = None
+        self.special_food = None
+        self.power_ups = ()
+        self.obstacles = ()
+        self.score = None
+        self.level = None
+        self.over = False
+
+    def command(self, code):
+        """Queue an input for the next tick"""
+        if code == RESTART:
+            self.restart = True
+        elif code < len(DIRECTIONS):
+            self.turn = DIRECTIONS[code]
+
+    def apply_input(self, seed):
+        """Apply queued inputs before the tick"""
+        game = self.engine
+        if self.restart:
+            self.restart = False
+            self.turn = None
+            game.new_game(seed)
+            game.recorder = None
+            self.head = None
+        if self.turn is not None:
+            dx, dy = self.turn
+            self.turn = None
+            # Reversing into the neck is ignored, like the key handler does
+            if game.state == GameState.PLAYING and (dx + game.direction.value[0] or
+                                                    dy + game.direction.value[1]):
+                game.direction = Direction((dx, dy))
+
+    def encode(self, out, width, full=False):
+        """Append this game's changes since the last broadcast, returns whether there were any
+
+        full encodes the whole state without touching what clients last saw,
+        for a client that has just joined.
+        """
+        game = self.engine
+        snake = game.snake
+        head = snake[0]
+        special_food = game.special_food
+        power_ups = tuple(game.power_ups)
+        obstacles = tuple(getattr(game, 'obstacles', ()))
+        over = game.state != GameState.PLAYING
+        fields = bytearray()
+
+        if self.left:
+            write_varint(out, self.id)
+            write_varint(out, LEFT)
+            return True
+
+        full = full or not self.announced
+        flags = 0
+        if full or head != self.head:
+            # A normal move keeps the old head right behind the new one
+            dropped = self.length + 1 - len(snake)
+            if not full and len(snake) > 1 and snake[1] == self.head and dropped >= 0:
+                flags |= SNAKE
+                write_varint(fields, head.y * width + head.x)
+                write_varint(fields, dropped)
+            else:
+                flags |= SNAKE_FULL
+                write_varint(fields, len(snake))
+                for cell in snake:
+                    write_varint(fields, cell.y * width + cell.x)
+        elif len(snake) != self.length:
+            # Shrunk without moving, resend the body
+            flags |= SNAKE_FULL
+            write_varint(fields, len(snake))
+            for cell in snake:
+                write_varint(fields, cell.y * width + cell.x)
+        if full or game.food != self.food:
+            flags |= FOOD
+            write_varint(fields, game.food.y * width + game.food.x)
+        if full or special_food != self.special_food:
+            flags |= SPECIAL_FOOD
+            write_varint(fields, special_food.y * width + special_food.x + 1 if special_food else 0)
+        if full or power_ups != self.power_ups:
+            flags |= POWER_UPS
+            write_varint(fields, len(power_ups))
+            for cell in power_ups:
+                write_varint(fields, cell.y * width + cell.x)
+        if full or obstacles != self.obstacles:
+            flags |= OBSTACLES
+            write_varint(fields, len(obstacles))
+            for cell in obstacles:
+                write_varint(fields, cell.y * width + cell.x)
+        if full or game.score != self.score or game.level != self.level:
+            flags |= SCORE
+            write_varint(fields, game.score)
+            write_varint(fields, game.level)
+        if over and (full or not self.over):
+            flags |= OVER
+
+        if not flags:
+            return False
+        write_varint(out, self.id)
+        write_varint(out, flags)
+        out += fields
+
+        if full and self.announced:
+            return True
+        self.announced = True
+        self.head = head
+        self.length = len(snake)
+        self.food = game.food
+        self.special_food = special_food
+        self.power_ups = power_ups
+        self.obstacles = obstacles
+        self.score = game.score
+        self.level = game.level
+        self.over = over
+        return True
+
+
+class Client:
+    """One connection; all of a tick's output goes out in a single write"""
+
+    def __init__(self, writer):
+        self.writer = writer
+        self.closed = False
+
+    def send(self, data):
+        """Queue bytes for the client, dropping it if it stopped reading"""
+        if self.closed:
+            return
+        transport = self.writer.transport
+        if transport.is_closing() or transport.get_write_buffer_size() > MAX_BUFFERED:
+            self.close()
+            return
+        self.writer.write(data)
+
+    def close(self):
+        if not self.closed:
+            self.closed = True
+            self.writer.close()
+
+
+class Arena:
+    """Players sharing one seed, advanced together one tick at a time"""
+
+    def __init__(self, name, variant, seed, interval):
+        self.name = name
+        self.variant = variant
+        self.seed = seed
+        self.interval = interval
+        self.tick = 0
+        self.players = {}
+        self.clients = []
+        self.next_id = 1
+        self.task = None
+        self.bytes_sent = 0
+        self.frames_sent = 0
+
+        probe = engine_for(variant)
+        self.width = probe.GRID_WIDTH
+        self.height = probe.GRID_HEIGHT
+
+    def join(self, client, play=True):
+        """Add a client, as a player unless it only watches"""
+        player_id = 0
+        if play:
+            player_id = self.next_id
+            self.next_id += 1
+            engine = engine_for(self.variant)
+            engine.new_game(self.seed)
+            engine.recorder = None
+            self.players[player_id] = Player(player_id, client, engine)
+
+        hello = bytearray(b'H')
+        for value in (player_id, self.width, self.height, self.seed):
+            write_varint(hello, value)
+        client.send(frame(hello))
+
+        # Keyframe of the games the others already know about
+        keyframe = bytearray(b'T')
+        write_varint(keyframe, self.tick)
+        for player in self.players.values():
+            if player.announced and not player.left:
+                player.encode(keyframe, self.width, full=True)
+        client.send(frame(keyframe))
+
+        self.clients.append(client)
+        if self.task is None:
+            self.task = asyncio.ensure_future(self.run())
+        return self.players.get(player_id)
+
+    def leave(self, client):
+        """Remove a client; its game is dropped on the next tick"""
+        if client in self.clients:
+            self.clients.remove(client)
+        for player in self.players.values():
+            if player.client is client:
+                player.left = True
+
+    def step(self):
+        """Advance every game one tick and broadcast what changed"""
+        self.tick += 1
+        for player in self.players.values():
+            if not player.left:
+                player.apply_input(self.seed)
+                player.engine.move_snake()
+
+        payload = bytearray(b'T')
+        write_varint(payload, self.tick)
+        for player in list(self.players.values()):
+            if player.encode(payload, self.width) and player.left:
+                del self.players[player.id]
+
+        data = frame(payload)
+        for client in self.clients:
+            client.send(data)
+        self.bytes_sent += len(data) * len(self.clients)
+        self.frames_sent += len(self.clients)
+
+    async def run(self):
+        """Tick on absolute deadlines until everyone has left"""
+        loop = asyncio.get_running_loop()
+        interval = self.interval / 1000
+        deadline = loop.time()
+        try:
+            while self.clients:
+                deadline += interval
+                delay = deadline - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                elif -delay > interval * MAX_CATCH_UP:
+                    deadline = loop.time()
+                self.step()
+        finally:
+            self.task = None
+
+
+class SnakeServer:
+    """Accepts bots and spectators and routes them to arenas by name"""
+
+    def __init__(self, variant='classic', interval=100, seed=0):
+        self.variant = variant
+        self.interval = interval
+        self.seed = seed
+        self.arenas = {}
+
+    def arena(self, name):
+        """Arena by name, created on first use with its own seed"""
+        if name not in self.arenas:
+            self.arenas[name] = Arena(name, self.variant, self.seed + len(self.arenas), self.interval)
+        return self.arenas[name]
+
+    async def handle(self, reader, writer):
+        """Serve one connection"""
+        client = Client(writer)
+        arena = None
+        try:
+            hello = await read_frame(reader, MAX_FRAME)
+            if hello[:1] not in (b'J', b'S'):
+                return
+            arena = self.arena(hello[1:].decode('utf-8', 'replace'))
+            player = arena.join(client, play=hello[:1] == b'J')
+            while True:
+                payload = await read_frame(reader, MAX_FRAME)
+                if player and payload:
+                    player.command(payload[-1])
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            if arena:
+                arena.leave(client)
+            client.close()
+
+    async def start(self, port=None, path=None, host='127.0.0.1'):
+        """Listen on a Unix socket if a path is given, otherwise on local TCP"""
+        if path:
+            return await asyncio.start_unix_server(self.handle, path)
+        return await asyncio.start_server(self.handle, host, port)
+
+
+class GameView:
+    """A client's copy of one game, rebuilt from tick frames"""
+
+    def __init__(self):
+        self.snake = deque()
+        self.food = None
+        self.special_food = None
+        self.power_ups = ()
+        self.obstacles = ()
+        self.score = 0
+        self.level = 1
+        self.over = False
+
+
+def apply_tick(games, payload, width):
+    """Update a dict of player id -> GameView from a tick frame, returns the tick"""
+    def cell(value):
+        return (value % width, value // width)
+
+    tick, pos = read_varint(payload, 1)
+    while pos < len(payload):
+        player_id, pos = read_varint(payload, pos)
+        flags, pos = read_varint(payload, pos)
+        if flags & LEFT:
+            games.pop(player_id, None)
+            continue
+        game = games.setdefault(player_id, GameView())
+
+        if flags & SNAKE:
+            head, pos = read_varint(payload, pos)
+            dropped, pos = read_varint(payload, pos)
+            game.snake.appendleft(cell(head))
+            for _ in range(dropped):
+                game.snake.pop()
+        if flags & SNAKE_FULL:
+            # Also sent for a new game
+            game.over = False
+            count, pos = read_varint(payload, pos)
+            game.snake.clear()
+            for _ in range(count):
+                value, pos = read_varint(payload, pos)
+                game.snake.append(cell(value))
+        if flags & FOOD:
+            value, pos = read_varint(payload, pos)
+            game.food = cell(value)
+        if flags & SPECIAL_FOOD:
+            value, pos = read_varint(payload, pos)
+            game.special_food = cell(value - 1) if value else None
+        for flag, name in ((POWER_UPS, 'power_ups'), (OBSTACLES, 'obstacles')):
+            if flags & flag:
+                count, pos = read_varint(payload, pos)
+                cells = []
+                for _ in range(count):
+                    value, pos = read_varint(payload, pos)
+                    cells.append(cell(value))
+                setattr(game, name, tuple(cells))
+        if flags & SCORE:
+            game.score, pos = read_varint(payload, pos)
+            game.level, pos = read_varint(payload, pos)
+        if flags & OVER:
+            game.over = True
+    return tick
+
+
+async def run_bot(arena, port=None, path=None, restarts=True):
+    """Stand-in client: joins an arena and lets the autopilot steer its snake"""
+    if path:
+        reader, writer = await asyncio.open_unix_connection(path)
+    else:
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    writer.write(frame(b'J' + arena.encode()))
+
+    hello = await read_frame(reader)
+    player_id, pos = read_varint(hello, 1)
+    width, pos = read_varint(hello, pos)
+    height, pos = read_varint(hello, pos)
+    autopilot = Autopilot(width, height, wrap=True)
+    codes = {direction: code for code, direction in enumerate(DIRECTIONS)}
+    games = {}
+    best = 0
+
+    try:
+        while True:
+            apply_tick(games, await read_frame(reader), width)
+            game = games.get(player_id)
+            if game is None or not game.snake:
+                continue
+            best = max(best, game.score)
+            if game.over:
+                if not restarts:
+                    break
+                autopilot.reset()
+                writer.write(frame(b'R'))
+                continue
+            direction = autopilot.next_direction(game.snake, game.food, game.obstacles)
+            writer.write(frame(bytes((codes[direction],))))
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+    return best
+
+
+async def tournament(args):
+    """Serve, optionally with local bots for a fixed time, and report traffic"""
+    server = SnakeServer(args.variant, args.interval, args.seed)
+    listener = await server.start(args.port, args.unix)
+    where = args.unix or f"127.0.0.1:{listener.sockets[0].getsockname()[1]}"
+    port = None if args.unix else listener.sockets[0].getsockname()[1]
+    print(f"Snake server on {where}, {args.interval} ms ticks")
+
+    bots = [asyncio.ensure_future(run_bot(f"arena-{i % args.arenas}", port, args.unix))
+            for i in range(args.bots)]
+    start = time.perf_counter()
+    if args.seconds:
+        await asyncio.sleep(args.seconds)
+    else:
+        await asyncio.Event().wait()
+    elapsed = time.perf_counter() - start
+
+    listener.close()
+    for arena in list(server.arenas.values()):
+        for client in list(arena.clients):
+            client.close()
+    scores = [score for score in await asyncio.gather(*bots, return_exceptions=True)
+              if isinstance(score, int)]
+
+    ticks = sum(arena.tick for arena in server.arenas.values())
+    sent = sum(arena.bytes_sent for arena in server.arenas.values())
+    frames = sum(arena.frames_sent for arena in server.arenas.values())
+    print(f"{len(server.arenas)} arenas, {args.bots} bots, {ticks / elapsed:,.0f} arena ticks/s")
+    print(f"Sent {frames:,} frames, {sent / max(frames, 1):.1f} bytes per frame on average")
+    if scores:
+        print(f"Best bot score {max(scores)}, mean {sum(scores) / len(scores):.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Snake tournament server")
+    parser.add_argument('--port', type=int, default=0)
+    parser.add_argument('--unix')
+    parser.add_argument('--variant', choices=('classic', 'advanced'), default='classic')
+    parser.add_argument('--interval', type=float, default=100, help="milliseconds per tick")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--bots', type=int, default=0, help="local autopilot bots to connect")
+    parser.add_argument('--arenas', type=int, default=1, help="arenas the local bots spread over")
+    parser.add_argument('--seconds', type=float, default=0, help="stop after this long")
+    asyncio.run(tournament(parser.parse_args()))
@@ -0,0 +1,301 @@
+"""
+Tetris AI
+Picks where to drop each piece in sixth.py.
+
+Every rotation and column of the current piece is tried, and on each of
+the resulting boards every rotation and column of the next piece. The
+final boards are scored on aggregate height, holes, bumpiness and lines
+cleared, and the current piece goes where the best pair starts.
+
+All candidate boards are built and scored together in NumPy. Boards are
+arrays of row bitmasks like TetrisBoard.rows. A placement is landed by
+comparing its bottom profile with the column tops, ORed into the rows,
+and full rows are squeezed out with one stable sort. A decision is a
+fixed handful of array operations over about a thousand boards.
+
+search() looks further ahead, one piece per level of recursion, for when a
+longer preview is known. Different placement orders and line clears lead
+to the same positions again and again, so node values are kept in a
+transposition table keyed on the board's Zobrist hash and the queued
+pieces, and siblings that land on the same board are searched once.
+"""
+
+from collections import OrderedDict
+import time
+
+import numpy as np
+
+from sixth import PieceGenerator, TetrisBoard, TetrisEngine, compile_rotations, zobrist_keys
+
+# (aggregate height, lines cleared, holes, bumpiness)
+DEFAULT_WEIGHTS = (-0.510066, 0.760666, -0.35663, -0.184483)
+
+
+class Placements:
+    """Every rotation and column of one piece type, as arrays"""
+
+    def __init__(self, rotations, width):
+        moves = [(r, x) for r, rotation in enumerate(rotations)
+                 for x in range(-rotation.left, width - rotation.right)]
+        count = len(moves)
+        self.moves = moves
+
+        # Bottom profile, padded to 4 columns by repeating the first one
+        self.columns = np.zeros((count, 4), dtype=np.intp)
+        self.depths = np.zeros((count, 4), dtype=np.int64)
+        # Row masks at dy = 0..3, already shifted to the piece's column
+        self.masks = np.zeros((count, 4), dtype=np.int64)
+        # Highest filled dy, which must land inside the well
+        self.top = np.zeros(count, dtype=np.int64)
+        for i, (r, x) in enumerate(moves):
+            rotation = rotations[r]
+            profile = list(rotation.profile)
+            profile += [profile[0]] * (4 - len(profile))
+            for k, (dx, dy) in enumerate(profile):
+                self.columns[i, k] = x + dx
+                self.depths[i, k] = dy
+            for dy, mask in rotation.masks:
+                self.masks[i, dy] = mask << (x + rotation.left)
+            self.top[i] = rotation.masks[0][0]
+
+
+class TranspositionTable:
+    """Bounded LRU cache of search results by position hash"""
+
+    def __init__(self, capacity=200000):
+        self.capacity = capacity
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """Cached result for a position, or None"""
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return entry
+
+    def put(self, key, entry):
+        """Remember a result, dropping the least recently used one when full"""
+        self.entries[key] = entry
+        if len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        """Forget everything, e.g. after the weights change"""
+        self.entries.clear()
+
+    @property
+    def hit_rate(self):
+        """Share of lookups answered from the table"""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class TetrisAI:
+    """Two-piece placement search with a linear board evaluation"""
+
+    def __init__(self, rotations, width=10, height=20, weights=DEFAULT_WEIGHTS, table_size=200000,
+                 preview=8):
+        self.width = width
+        self.height = height
+        self.full_row = (1 << width) - 1
+        self.weights = np.array(weights, dtype=np.float64)
+        self.placements = {piece_type: Placements(shapes, width)
+                           for piece_type, shapes in rotations.items()}
+        self.columns = np.arange(width, dtype=np.int64)
+        self.row_index = np.arange(height)
+        self.decisions = 0
+        self.elapsed = 0.0
+
+        # Same keys as TetrisBoard.hash, as arrays to hash many boards at once;
+        # search() takes queues of up to preview pieces
+        row_keys, self.piece_keys = zobrist_keys(width, height, preview)
+        self.row_keys = np.array(row_keys, dtype=np.uint64)
+        self.table = TranspositionTable(table_size)
+        self.nodes = 0
+
+    def features(self, rows):
+        """Column tops and (height, holes, bumpiness) for boards of shape (..., height)"""
+        bits = (rows[..., None] >> self.columns) & 1
+        filled = bits.any(axis=-2)
+        first = bits.argmax(axis=-2)
+        tops = np.where(filled, first, self.height)
+        heights = self.height - tops
+        holes = heights.sum(axis=-1) - bits.sum(axis=(-2, -1))
+        bumpiness = np.abs(np.diff(heights, axis=-1)).sum(axis=-1)
+        return tops, heights.sum(axis=-1), holes, bumpiness
+
+    def evaluate(self, boards, lines, valid):
+        """Weighted score of each board, -inf where the drop left the well"""
+        _, height, holes, bumpiness = self.features(boards)
+        scores = np.stack((height, lines, holes, bumpiness), axis=-1) @ self.weights
+        return np.where(valid, scores, -np.inf)
+
+    def drop(self, rows, tops, placements):
+        """Drop every placement on every board
+
+        rows (B, height) and tops (B, width) give boards, returns the boards
+        after each drop and line clear (B, P, height), the lines cleared
+        (B, P), and whether each drop stayed inside the well (B, P).
+        """
+        height = self.height
+        land = (tops[:, placements.columns] - 1 - placements.depths).min(axis=-1)
+        valid = land + placements.top >= 0
+
+        boards = np.repeat(rows[:, None, :], len(placements.moves), axis=1)
+        b, p = np.nonzero(valid)
+        for dy in range(4):
+            mask = placements.masks[p, dy]
+            row = land[b, p] + dy
+            keep = (mask != 0) & (row < height)
+            boards[b[keep], p[keep], row[keep]] |= mask[keep]
+
+        # Full rows sort to the top, where they are blanked out
+        full = boards == self.full_row
+        lines = full.sum(axis=-1)
+        if lines.any():
+            order = np.argsort(~full, axis=-1, kind='stable')
+            boards = np.take_along_axis(boards, order, axis=-1)
+            boards[self.row_index < lines[..., None]] = 0
+        return boards, lines, valid
+
+    def best_placement(self, board, piece_type, next_type=None):
+        """(rotation, x) for the current piece on a TetrisBoard, or None if it cannot fit"""
+        start = time.perf_counter()
+        rows = np.array([board.rows], dtype=np.int64)
+        tops = np.array([board.tops], dtype=np.int64)
+        first = self.placements[piece_type]
+        boards, lines, valid = self.drop(rows, tops, first)
+        boards, lines, valid = boards[0], lines[0], valid[0]
+        if not valid.any():
+            return None
+
+        scores = None
+        if next_type is not None:
+            # Look one piece ahead from each board the current piece can leave
+            tops, _, _, _ = self.features(boards)
+            second, more_lines, more_valid = self.drop(boards, tops, self.placements[next_type])
+            ahead = self.evaluate(second, lines[:, None] + more_lines, valid[:, None] & more_valid)
+            ahead = ahead.max(axis=1)
+            if not np.isneginf(ahead).all():
+                scores = ahead
+        if scores is None:
+            # No lookahead, or no first move leaves room for the next piece
+            scores = self.evaluate(boards, lines, valid)
+        best = int(scores.argmax())
+
+        self.decisions += 1
+        self.elapsed += time.perf_counter() - start
+        return first.moves[best]
+
+    def hash_boards(self, boards):
+        """Zobrist hash of each board in a (..., height) array of rows"""
+        return np.bitwise_xor.reduce(self.row_keys[self.row_index, boards], axis=-1)
+
+    def queue_key(self, queue):
+        """Hash contribution of the queued piece types"""
+        key = 0
+        for i, piece_type in enumerate(queue):
+            key ^= self.piece_keys[i][piece_type]
+        return key
+
+    def search(self, board, queue):
+        """(rotation, x) for queue[0] on a TetrisBoard, looking ahead through the whole queue"""
+        if len(queue) > len(self.piece_keys):
+            raise ValueError(f"queue of {len(queue)} pieces is longer than the {len(self.piece_keys)} "
+                             f"the AI's hash keys cover")
+        start = time.perf_counter()
+        rows = np.array(board.rows, dtype=np.int64)
+        value, best = self.expand(rows, tuple(queue), board.key(queue))
+        self.decisions += 1
+        self.elapsed += time.perf_counter() - start
+        if best is None:
+            return None
+        if value == -np.inf:
+            # Every line dies within the queue, settle for the best next move
+            return self.best_placement(board, queue[0], queue[1] if len(queue) > 1 else None)
+        return self.placements[queue[0]].moves[best]
+
+    def expand(self, rows, queue, key):
+        """(value, best placement index) of a board with pieces still to place"""
+        entry = self.table.get(key)
+        if entry is not None:
+            return entry
+        self.nodes += 1
+
+        tops, _, _, _ = self.features(rows[None])
+        boards, lines, valid = self.drop(rows[None], tops, self.placements[queue[0]])
+        boards, lines, valid = boards[0], lines[0], valid[0]
+        if len(queue) == 1:
+            values = self.evaluate(boards, lines, valid)
+        else:
+            rest = queue[1:]
+            rest_key = self.queue_key(rest)
+            hashes = self.hash_boards(boards)
+            values = np.full(len(lines), -np.inf)
+            # Siblings that leave the same board share one search
+            seen = {}
+            for i in np.flatnonzero(valid):
+                board_hash = int(hashes[i])
+                if board_hash not in seen:
+                    seen[board_hash] = self.expand(boards[i], rest, board_hash ^ rest_key)[0]
+                values[i] = seen[board_hash] + self.weights[1] * lines[i]
+
+        entry = (-np.inf, None) if not valid.any() else (values.max(), int(values.argmax()))
+        self.table.put(key, entry)
+        return entry
+
+
+def play(ai, pieces=1000, width=10, height=20, seed=None, preview=1, mode='uniform'):
+    """Let the AI place pieces on a bare board, returns (pieces placed, lines cleared)
+
+    preview is how many upcoming pieces the AI is shown; beyond the one the
+    game shows it searches the whole queue. mode picks the PieceGenerator mode.
+    """
+    rotations = ai_rotations()
+    # Same type order as TetrisEngine, so a seed deals the same pieces in both
+    generator = PieceGenerator(TetrisEngine.SHAPES, mode, seed)
+    board = TetrisBoard(width, height, preview + 1)
+    queue = generator.take(preview + 1)
+    lines = 0
+    for placed in range(pieces):
+        current = queue[0]
+        if preview > 1:
+            move = ai.search(board, queue)
+        else:
+            move = ai.best_placement(board, current, queue[1] if preview else None)
+        if move is None:
+            return placed, lines
+        r, x = move
+        rotation = rotations[current][r]
+        y = board.drop_row(rotation, x, -4)
+        if y + rotation.masks[0][0] < 0:
+            return placed, lines
+        board.place([(x + dx, y + dy) for dx, dy in rotation.cells], current)
+        lines += board.clear_lines()
+        queue = queue[1:] + [generator.next()]
+    return pieces, lines
+
+
+def ai_rotations():
+    """Rotation tables of the live game, without opening a window"""
+    return compile_rotations(TetrisEngine.SHAPES)
+
+
+if __name__ == "__main__":
+    ai = TetrisAI(ai_rotations())
+    placed, lines = play(ai, pieces=2000, seed=1)
+    print(f"Placed {placed} pieces, cleared {lines} lines")
+    print(f"{ai.elapsed / ai.decisions * 1000:.2f} ms per decision with one piece of lookahead")
+
+    # Deeper search, to size the transposition table
+    ai = TetrisAI(ai_rotations())
+    placed, lines = play(ai, pieces=200, seed=1, preview=2)
+    table = ai.table
+    print(f"Placed {placed} pieces, cleared {lines} lines searching two pieces ahead")
+    print(f"{ai.nodes / ai.elapsed:,.0f} nodes/s, {ai.elapsed / ai.decisions * 1000:.1f} ms per decision, "
+          f"table hit rate {table.hit_rate:.1%} with {len(table.entries):,} of {table.capacity:,} entries")
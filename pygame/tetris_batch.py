@@ -0,0 +1,106 @@
+"""
+Tetris Batch
+Plays many seeded headless Tetris games and reports how they went.
+
+A policy is any callable that takes a TetrisEngine and returns the
+(rotation, x) to drop its current piece at, or None to let the piece fall
+where it is. Every game gets its own seed, so a batch can be rerun exactly
+to compare policies or engine changes.
+"""
+
+import argparse
+import random
+import statistics
+import time
+
+from sixth import TetrisEngine
+
+
+class RandomPolicy:
+    """Drops each piece in a random rotation and column"""
+
+    def __init__(self, seed=None):
+        self.rng = random.Random(seed)
+
+    def __call__(self, engine):
+        """Random (rotation, x) that keeps the piece inside the well"""
+        piece = engine.current_piece
+        rotations = engine.ROTATIONS[piece.type]
+        r = self.rng.randrange(len(rotations))
+        rotation = rotations[r]
+        return r, self.rng.randrange(-rotation.left, engine.GRID_WIDTH - rotation.right)
+
+
+class AIPolicy:
+    """Drops each piece where the Tetris AI puts it, seeing the next piece as a player would"""
+
+    def __init__(self, weights=None):
+        # tetris_ai needs NumPy, so it is only imported when this policy is used
+        from tetris_ai import DEFAULT_WEIGHTS, TetrisAI, ai_rotations
+        self.ai = TetrisAI(ai_rotations(), weights=DEFAULT_WEIGHTS if weights is None else weights)
+
+    def __call__(self, engine):
+        """(rotation, x) of the AI's best placement"""
+        return self.ai.best_placement(engine.board, engine.current_piece.type, engine.next_piece.type)
+
+
+def play_game(policy, seed, max_pieces=1000, mode='uniform'):
+    """Play one game to the end or the piece limit, returns the finished engine"""
+    engine = TetrisEngine(seed, mode=mode)
+    while not engine.game_over and engine.pieces < max_pieces:
+        move = policy(engine)
+        if move is None:
+            engine.hard_drop()
+            engine.drop_piece()
+        else:
+            engine.place_piece(*move)
+    return engine
+
+
+def run_batch(policy, games=100, seed=0, max_pieces=1000, mode='uniform'):
+    """Play a batch of games seeded seed, seed + 1, ..., returns the engines and seconds taken"""
+    start = time.perf_counter()
+    engines = [play_game(policy, seed + game, max_pieces, mode) for game in range(games)]
+    return engines, time.perf_counter() - start
+
+
+def report(engines, elapsed):
+    """Print throughput, the score distribution and how many lines went at once"""
+    pieces = sum(engine.pieces for engine in engines)
+    scores = sorted(engine.score for engine in engines)
+    print(f"{len(engines)} games, {pieces:,} pieces in {elapsed:.2f}s: {pieces / elapsed:,.0f} pieces/s")
+
+    if len(scores) > 1:
+        q1, median, q3 = statistics.quantiles(scores, n=4)
+    else:
+        q1 = median = q3 = scores[0]
+    print(f"Score: min {scores[0]:,}, quartiles {q1:,.0f} / {median:,.0f} / {q3:,.0f}, "
+          f"max {scores[-1]:,}, mean {statistics.mean(scores):,.0f}")
+
+    # Score histogram in ten equal buckets
+    width = max(1, (scores[-1] - scores[0] + 10) // 10)
+    buckets = [0] * 10
+    for score in scores:
+        buckets[min(9, (score - scores[0]) // width)] += 1
+    tallest = max(buckets)
+    for i, count in enumerate(buckets):
+        low = scores[0] + i * width
+        print(f"  {low:>9,} - {low + width - 1:>9,} | {'#' * round(40 * count / tallest):<40} {count}")
+
+    clears = [sum(engine.line_clears[lines] for engine in engines) for lines in range(5)]
+    names = ['', 'Singles', 'Doubles', 'Triples', 'Tetrises']
+    print(f"Line clears over {pieces:,} pieces: "
+          + ", ".join(f"{names[lines]} {clears[lines]:,}" for lines in range(1, 5)))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Play seeded headless Tetris games")
+    parser.add_argument('--games', type=int, default=100)
+    parser.add_argument('--seed', type=int, default=0, help="seed of the first game")
+    parser.add_argument('--policy', choices=('random', 'ai'), default='random')
+    parser.add_argument('--pieces', type=int, default=1000, help="piece limit per game")
+    parser.add_argument('--mode', choices=('uniform', 'bag'), default='uniform', help="piece randomizer")
+    args = parser.parse_args()
+
+    policy = RandomPolicy(args.seed) if args.policy == 'random' else AIPolicy()
+    report(*run_batch(policy, args.games, args.seed, args.pieces, args.mode))
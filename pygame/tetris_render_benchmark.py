@@ -0,0 +1,64 @@
+"""
+Tetris Render Benchmark
+Times full-board frames of sixth.py's tile renderer against the renderer it
+replaced, on the same display.
+
+The old renderer drew every cell as a rectangle plus two white highlight
+lines, three canvas items reconfigured per changed cell. It lives here as a
+small TetrisGame subclass that swaps only how cell items are created and
+painted, so both renderers run the exact same frames.
+"""
+
+import argparse
+
+from sixth import TetrisGame
+
+
+class RectangleTetrisGame(TetrisGame):
+    """TetrisGame drawing cells as a rectangle with top and left highlight lines"""
+
+    def create_cell_items(self):
+        """Three hidden items per well cell: the block and its two highlights"""
+        size = self.CELL_SIZE
+        self.cell_items = [
+            [(self.canvas.create_rectangle(x * size + 1, y * size + 1, (x + 1) * size - 1, (y + 1) * size - 1,
+                                           state="hidden"),
+              self.canvas.create_line(x * size + 1, y * size + 1, (x + 1) * size - 1, y * size + 1,
+                                      fill="#ffffff", width=2, state="hidden"),
+              self.canvas.create_line(x * size + 1, y * size + 1, x * size + 1, (y + 1) * size - 1,
+                                      fill="#ffffff", width=2, state="hidden"))
+             for x in range(self.GRID_WIDTH)]
+            for y in range(self.GRID_HEIGHT)
+        ]
+
+    def paint_cell(self, x, y, style):
+        """Show a cell as empty, a solid block or a ghost outline"""
+        rect, top, left = self.cell_items[y][x]
+        size = self.CELL_SIZE
+        canvas = self.canvas
+        if style is None:
+            for item in (rect, top, left):
+                canvas.itemconfigure(item, state="hidden")
+        elif style[0] == 'ghost':
+            canvas.coords(rect, x * size + 2, y * size + 2, (x + 1) * size - 2, (y + 1) * size - 2)
+            canvas.itemconfigure(rect, state="normal", fill="", outline=style[1], width=2, stipple="gray50")
+            canvas.itemconfigure(top, state="hidden")
+            canvas.itemconfigure(left, state="hidden")
+        else:
+            canvas.coords(rect, x * size + 1, y * size + 1, (x + 1) * size - 1, (y + 1) * size - 1)
+            canvas.itemconfigure(rect, state="normal", fill=style[1], outline="#ffffff", width=1, stipple="")
+            canvas.itemconfigure(top, state="normal")
+            canvas.itemconfigure(left, state="normal")
+        self.cell_styles[y][x] = style
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare the Tetris cell renderers")
+    parser.add_argument('--frames', type=int, default=200)
+    args = parser.parse_args()
+
+    # Same frames through both renderers, one window after the other
+    for name, game_class in (("rectangles", RectangleTetrisGame), ("tiles", TetrisGame)):
+        game = game_class()
+        print(f"{name:>10}: {game.benchmark(args.frames):.2f} ms per full-board frame")
+        game.root.destroy()
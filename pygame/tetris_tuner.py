@@ -0,0 +1,165 @@
+"""
+Tetris Tuner
+Evolves the weights of the Tetris AI by playing lots of headless games.
+
+Each generation, every candidate weight vector plays the same handful of
+seeded games (same seeds for everyone, so luck evens out) and is scored on
+lines cleared. The games run on TetrisEngine through tetris_batch, so the
+weights are tuned against the rules the real game plays by. Games are
+spread one per task over a multiprocessing pool; every task carries its
+own piece seed, so results do not depend on which worker ran it. The
+fittest candidates are bred by fitness-weighted crossover plus mutation
+and replace the weakest 30%.
+
+The population is written to a JSON checkpoint after every generation and
+an interrupted run picks up from the last one.
+"""
+
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import random
+import time
+
+import tetris_batch
+from tetris_ai import DEFAULT_WEIGHTS
+
+# Set up once in each worker process
+worker_policy = None
+
+
+def init_worker():
+    """Build the worker's AI policy; its placement tables are reused for every game"""
+    global worker_policy
+    worker_policy = tetris_batch.AIPolicy()
+
+
+def play_game(task):
+    """Play one game with the given weights, returns (candidate, pieces, lines)"""
+    candidate, weights, pieces, seed = task
+    worker_policy.ai.weights[:] = weights
+    worker_policy.ai.table.clear()
+    engine = tetris_batch.play_game(worker_policy, seed, pieces)
+    return candidate, engine.pieces, engine.lines_cleared
+
+
+def normalize(weights):
+    """Scale to unit length; scaling the weights never changes a decision"""
+    length = math.sqrt(sum(w * w for w in weights)) or 1.0
+    return [w / length for w in weights]
+
+
+class Tuner:
+    """Genetic search over evaluation weights, checkpointed to a JSON file"""
+
+    def __init__(self, path, population=100, games=5, pieces=500, seed=0):
+        self.path = path
+        self.size = population
+        self.games = games
+        self.pieces = pieces
+        self.seed = seed
+        self.generation = 0
+        self.history = []  # (best, mean) lines per game of each generation
+
+        if os.path.exists(path):
+            self.load()
+        else:
+            rng = random.Random(f"{seed}:init")
+            self.population = [normalize(DEFAULT_WEIGHTS)]
+            while len(self.population) < population:
+                self.population.append(normalize([rng.uniform(-1, 1) for _ in DEFAULT_WEIGHTS]))
+
+    def load(self):
+        """Pick up a run from its checkpoint"""
+        with open(self.path, 'r') as f:
+            state = json.load(f)
+        self.size = state['size']
+        self.games = state['games']
+        self.pieces = state['pieces']
+        self.seed = state['seed']
+        self.generation = state['generation']
+        self.history = [tuple(entry) for entry in state['history']]
+        self.population = state['population']
+
+    def save(self, best):
+        """Write the checkpoint, replacing the old one only once the new one is complete"""
+        state = {
+            'size': self.size, 'games': self.games, 'pieces': self.pieces, 'seed': self.seed,
+            'generation': self.generation, 'history': self.history,
+            'population': self.population, 'best': best,
+        }
+        partial = self.path + '.tmp'
+        with open(partial, 'w') as f:
+            json.dump(state, f)
+        os.replace(partial, self.path)
+
+    def evaluate(self, pool):
+        """Lines cleared per candidate, summed over this generation's games"""
+        rng = random.Random(f"{self.seed}:{self.generation}:games")
+        seeds = [rng.getrandbits(32) for _ in range(self.games)]
+        tasks = [(candidate, weights, self.pieces, seed)
+                 for candidate, weights in enumerate(self.population) for seed in seeds]
+        fitness = [0] * len(self.population)
+        placed = 0
+        for candidate, pieces, lines in pool.imap_unordered(play_game, tasks):
+            fitness[candidate] += lines
+            placed += pieces
+        return fitness, placed
+
+    def breed(self, fitness):
+        """Replace the weakest 30% with children of tournament winners"""
+        rng = random.Random(f"{self.seed}:{self.generation}")
+        count = len(self.population)
+        ranked = sorted(range(count), key=fitness.__getitem__, reverse=True)
+        children = []
+        for _ in range(max(1, count * 3 // 10)):
+            # Best two of a random tenth of the population
+            entrants = sorted(rng.sample(range(count), max(2, count // 10)),
+                              key=fitness.__getitem__, reverse=True)
+            a, b = entrants[0], entrants[1]
+            fa, fb = fitness[a] + 1, fitness[b] + 1
+            child = [(fa * wa + fb * wb) for wa, wb in zip(self.population[a], self.population[b])]
+            if rng.random() < 0.05:
+                child[rng.randrange(len(child))] += rng.uniform(-0.2, 0.2)
+            children.append(normalize(child))
+        survivors = [self.population[i] for i in ranked[:count - len(children)]]
+        self.population = survivors + children
+
+    def run(self, generations, processes=None):
+        """Evolve for a number of further generations, checkpointing after each"""
+        with multiprocessing.Pool(processes, initializer=init_worker) as pool:
+            for _ in range(generations):
+                start = time.perf_counter()
+                fitness, placed = self.evaluate(pool)
+                elapsed = time.perf_counter() - start
+
+                best = max(fitness) / self.games
+                mean = sum(fitness) / len(fitness) / self.games
+                self.history.append((best, mean))
+                leader = self.population[fitness.index(max(fitness))]
+                print(f"Generation {self.generation}: best {best:.1f} lines/game, mean {mean:.1f}, "
+                      f"{placed / elapsed:,.0f} pieces/s, "
+                      f"weights {', '.join(f'{w:.3f}' for w in leader)}")
+
+                self.breed(fitness)
+                self.generation += 1
+                self.save(leader)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Tune the Tetris AI weights")
+    parser.add_argument('--checkpoint', default='tetris_tuning.json')
+    parser.add_argument('--generations', type=int, default=10)
+    parser.add_argument('--population', type=int, default=100)
+    parser.add_argument('--games', type=int, default=5, help="games per candidate per generation")
+    parser.add_argument('--pieces', type=int, default=500, help="piece limit per game")
+    parser.add_argument('--processes', type=int, help="worker processes, default one per core")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    tuner = Tuner(args.checkpoint, args.population, args.games, args.pieces, args.seed)
+    if tuner.generation:
+        print(f"Resuming from generation {tuner.generation}")
+    tuner.run(args.generations, args.processes)
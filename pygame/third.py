@@ -5,6 +5,7 @@ A classic implementation with all features in a single file.
 import pygame
 import random
 import sys
+from snake_hamiltonian import HamiltonianSolver
 
 # Initialize Pygame
 pygame.init()
@@ -109,7 +110,10 @@ class Food:
         self.position = (5, 5)
         
     def spawn(self, snake_body):
-        """Spawn food at a random valid position."""
+        """Spawn food at a random valid position, or None once the board is full."""
+        if len(set(snake_body)) >= GRID_WIDTH * GRID_HEIGHT:
+            self.position = None
+            return
         while True:
             x = random.randint(0, GRID_WIDTH - 1)
             y = random.randint(0, GRID_HEIGHT - 1)
@@ -130,6 +134,113 @@ class Food:
         pygame.draw.rect(screen, BLACK, rect, 1)
 
 
+class DirtyRenderer:
+    """Redraws only the cells and text that changed since the last frame."""
+    
+    def __init__(self, screen):
+        """Pre-render the empty board and start with a full refresh."""
+        self.screen = screen
+        self.background = pygame.Surface(screen.get_size())
+        self.background.fill(BLACK)
+        for x in range(0, WINDOW_WIDTH, GRID_SIZE):
+            pygame.draw.line(self.background, (20, 20, 20), (x, 0), (x, WINDOW_HEIGHT))
+        for y in range(0, WINDOW_HEIGHT, GRID_SIZE):
+            pygame.draw.line(self.background, (20, 20, 20), (0, y), (WINDOW_WIDTH, y))
+        
+        self.cells = {}  # cell -> color currently on screen
+        self.texts = {}  # name -> (surface, position, grid-aligned region)
+        self.full_refresh = True
+    
+    def invalidate(self):
+        """Repaint the whole window on the next frame."""
+        self.full_refresh = True
+    
+    def cell_rect(self, cell):
+        """Screen rectangle of a grid cell."""
+        x, y = cell
+        return pygame.Rect(x * GRID_SIZE, y * GRID_SIZE, GRID_SIZE, GRID_SIZE)
+    
+    def paint_cell(self, cell, color):
+        """Draw one cell, or restore the empty board under it."""
+        rect = self.cell_rect(cell)
+        if color is None:
+            self.screen.blit(self.background, rect, rect)
+        else:
+            pygame.draw.rect(self.screen, color, rect)
+            pygame.draw.rect(self.screen, BLACK, rect, 1)
+        return rect
+    
+    def paint_region(self, region):
+        """Repaint a grid-aligned region: board, cells, then any text inside it."""
+        self.screen.blit(self.background, region, region)
+        for x in range(region.left // GRID_SIZE, region.right // GRID_SIZE):
+            for y in range(region.top // GRID_SIZE, region.bottom // GRID_SIZE):
+                color = self.cells.get((x, y))
+                if color is not None:
+                    self.paint_cell((x, y), color)
+        for surface, position, text_region in self.texts.values():
+            if text_region.colliderect(region):
+                self.screen.blit(surface, position)
+    
+    def set_text(self, name, surface, position):
+        """Place a line of text, returns the regions that need repainting."""
+        rect = surface.get_rect(topleft=position)
+        # Snap to whole cells so cells under the text are repainted whole
+        left = rect.left // GRID_SIZE * GRID_SIZE
+        top = rect.top // GRID_SIZE * GRID_SIZE
+        right = -(-rect.right // GRID_SIZE) * GRID_SIZE
+        bottom = -(-rect.bottom // GRID_SIZE) * GRID_SIZE
+        region = pygame.Rect(left, top, right - left, bottom - top).clip(self.screen.get_rect())
+        
+        old = self.texts.get(name)
+        self.texts[name] = (surface, position, region)
+        return [old[2], region] if old else [region]
+    
+    def render(self, snake, food, texts):
+        """Bring the screen up to date, returns the rectangles that changed.
+        
+        texts maps a name to (surface, position); pass the same surface
+        object again when the text has not changed.
+        """
+        wanted = dict.fromkeys(snake.body, DARK_GREEN)
+        wanted[snake.body[0]] = GREEN
+        if food is not None:
+            wanted[food] = RED
+        
+        regions = []
+        for name, (surface, position) in texts.items():
+            old = self.texts.get(name)
+            if old is None or old[0] is not surface or old[1] != position:
+                regions.extend(self.set_text(name, surface, position))
+        
+        if self.full_refresh:
+            self.full_refresh = False
+            self.cells = wanted
+            self.screen.blit(self.background, (0, 0))
+            for cell, color in wanted.items():
+                self.paint_cell(cell, color)
+            for surface, position, _ in self.texts.values():
+                self.screen.blit(surface, position)
+            return [self.screen.get_rect()]
+        
+        # Only the new head, the old head, the vacated tail and the food differ
+        dirty = []
+        cells = self.cells
+        for cell in cells.keys() | wanted.keys():
+            color = wanted.get(cell)
+            if cells.get(cell) != color:
+                dirty.append(self.paint_cell(cell, color))
+        self.cells = wanted
+        
+        # Text sits on top of the board, so repaint it wherever a cell under it changed
+        for _, _, region in self.texts.values():
+            if region.collidelist(dirty) != -1:
+                regions.append(region)
+        for region in regions:
+            self.paint_region(region)
+        return dirty + regions
+
+
 class SnakeGame:
     def __init__(self):
         """Initialize the game."""
@@ -141,6 +252,7 @@ class SnakeGame:
         self.score = 0
         self.game_over = False
         self.clock = pygame.time.Clock()
+        self.solver = None
         
         # Initialize food position
         self.food.spawn(self.snake.body)
@@ -150,6 +262,13 @@ class SnakeGame:
         self.title_font = pygame.font.Font(None, 72)
         self.small_font = pygame.font.Font(None, 24)
         
+        # Only changed cells are pushed to the display each frame
+        self.renderer = DirtyRenderer(self.screen)
+        self.score_text = None
+        self.score_shown = None
+        self.controls_text = self.small_font.render("Use Arrow Keys or WASD to move", True, GRAY)
+        self.game_over_shown = False
+        
     def handle_events(self):
         """Handle all game events."""
         for event in pygame.event.get():
@@ -162,6 +281,9 @@ class SnakeGame:
                         self.reset_game()
                     elif event.key == pygame.K_ESCAPE:
                         return False
+                elif event.key == pygame.K_h:
+                    # Toggle the Hamiltonian solver, which never dies
+                    self.solver = None if self.solver else HamiltonianSolver(GRID_WIDTH, GRID_HEIGHT)
                 else:
                     if event.key == pygame.K_UP or event.key == pygame.K_w:
                         self.snake.change_direction(UP)
@@ -178,6 +300,12 @@ class SnakeGame:
         """Update game state."""
         if self.game_over:
             return
+        
+        # Let the solver steer, the tail cell is free unless the snake is growing
+        if self.solver:
+            body = self.snake.body
+            occupied = set(body if self.snake.grow_pending else body[:-1])
+            self.snake.change_direction(self.solver.next_direction(body, self.food.position, occupied))
             
         self.snake.move()
         
@@ -186,6 +314,8 @@ class SnakeGame:
             self.snake.grow()
             self.score += 10
             self.food.spawn(self.snake.body)
+            if self.food.position is None:
+                self.game_over = True
         
         # Check for collisions
         if self.snake.check_collision():
@@ -199,30 +329,26 @@ class SnakeGame:
             pygame.draw.line(self.screen, GRAY, (0, y), (WINDOW_WIDTH, y))
     
     def draw(self):
-        """Draw all game elements."""
-        self.screen.fill(BLACK)
+        """Draw all game elements, returns the screen rectangles that changed."""
+        if self.game_over:
+            # The game over screen is static, draw it once
+            if self.game_over_shown:
+                return []
+            self.game_over_shown = True
+            self.renderer.invalidate()
+            self.screen.blit(self.renderer.background, (0, 0))
+            self.draw_game_over_screen()
+            return [self.screen.get_rect()]
         
-        # Draw subtle grid
-        for x in range(0, WINDOW_WIDTH, GRID_SIZE):
-            pygame.draw.line(self.screen, (20, 20, 20), (x, 0), (x, WINDOW_HEIGHT))
-        for y in range(0, WINDOW_HEIGHT, GRID_SIZE):
-            pygame.draw.line(self.screen, (20, 20, 20), (0, y), (WINDOW_WIDTH, y))
+        # Score text is only re-rendered when the score changes
+        if self.score != self.score_shown:
+            self.score_shown = self.score
+            self.score_text = self.font.render(f"Score: {self.score}", True, WHITE)
         
-        if not self.game_over:
-            # Draw game elements
-            self.snake.draw(self.screen)
-            self.food.draw(self.screen)
-            
-            # Draw score
-            score_text = self.font.render(f"Score: {self.score}", True, WHITE)
-            self.screen.blit(score_text, (10, 10))
-            
-            # Draw controls hint
-            controls_text = self.small_font.render("Use Arrow Keys or WASD to move", True, GRAY)
-            self.screen.blit(controls_text, (10, WINDOW_HEIGHT - 30))
-            
-        else:
-            self.draw_game_over_screen()
+        return self.renderer.render(self.snake, self.food.position, {
+            'score': (self.score_text, (10, 10)),
+            'controls': (self.controls_text, (10, WINDOW_HEIGHT - 30)),
+        })
     
     def draw_game_over_screen(self):
         """Draw the game over screen with score and instructions."""
@@ -266,14 +392,19 @@ class SnakeGame:
         """Reset the game to initial state."""
         self.snake.reset()
         self.food.spawn(self.snake.body)
+        if self.solver:
+            self.solver.reset()
         self.score = 0
         self.game_over = False
+        self.game_over_shown = False
+        self.renderer.invalidate()
     
     def run(self):
         """Main game loop."""
         print("🐍 Snake Game Started!")
         print("Controls:")
         print("- Arrow Keys or WASD to move")
+        print("- H to toggle the Hamiltonian solver")
         print("- SPACE to restart when game over")
         print("- ESC to quit")
         print("- Eat red food to grow and score points!")
@@ -282,8 +413,7 @@ class SnakeGame:
         while running:
             running = self.handle_events()
             self.update()
-            self.draw()
-            pygame.display.flip()
+            pygame.display.update(self.draw())
             self.clock.tick(FPS)
         
         pygame.quit()
@@ -0,0 +1,80 @@
+"""
+Tick Scheduler
+Drift-free game loop timing for the tkinter games.
+
+root.after(interval) after a tick's work makes every tick last the interval
+plus however long the tick took, so game speed depends on render cost. The
+scheduler instead aims each tick at an absolute deadline on a monotonic
+clock: a tick that ran late is followed by a shorter wait, and ticks that
+were missed entirely are caught up back to back, up to max_catch_up of
+them, after which the schedule is resynchronised to the present.
+"""
+
+from collections import deque
+import time
+
+
+class TickScheduler:
+    """Schedules a tkinter game loop on absolute deadlines"""
+
+    def __init__(self, root, max_catch_up=3, window=120, clock=time.perf_counter):
+        self.root = root
+        self.max_catch_up = max_catch_up
+        self.clock = clock
+        self.deadline = None
+        self.pending = None
+        self.ticks = 0
+        self.dropped = 0
+        # How late recent ticks fired, in milliseconds
+        self.lateness = deque(maxlen=window)
+
+    def schedule(self, callback, interval):
+        """Run callback one interval (in ms) after the previous deadline
+
+        Replaces any tick that is still pending, so calling the game loop
+        directly never leaves two loops running.
+        """
+        now = self.clock() * 1000
+        if self.pending is not None:
+            self.root.after_cancel(self.pending)
+
+        if self.deadline is None:
+            deadline = now + interval
+        else:
+            deadline = self.deadline + interval
+            behind = now - deadline
+            # Too far behind to catch up, skip the missed ticks
+            if behind > interval * self.max_catch_up:
+                self.dropped += int(behind // interval)
+                deadline = now
+
+        self.deadline = deadline
+        delay = max(0, round(deadline - now))
+        self.pending = self.root.after(delay, self.fire, callback)
+
+    def fire(self, callback):
+        """Run a due tick and note how late it was"""
+        self.pending = None
+        self.ticks += 1
+        self.lateness.append(self.clock() * 1000 - self.deadline)
+        callback()
+
+    def reset(self):
+        """Forget the schedule, e.g. while the game is paused"""
+        if self.pending is not None:
+            self.root.after_cancel(self.pending)
+            self.pending = None
+        self.deadline = None
+        self.lateness.clear()
+
+    @property
+    def jitter(self):
+        """Mean absolute lateness of recent ticks in milliseconds"""
+        if not self.lateness:
+            return 0.0
+        return sum(abs(late) for late in self.lateness) / len(self.lateness)
+
+    @property
+    def worst_jitter(self):
+        """Largest absolute lateness of recent ticks in milliseconds"""
+        return max((abs(late) for late in self.lateness), default=0.0)